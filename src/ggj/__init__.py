@@ -0,0 +1,4 @@
+import time
+
+# When the package was first imported, startup is timed from here.
+IMPORT_STARTED = time.perf_counter()
@@ -1,5 +1,8 @@
+from functools import lru_cache
 from pathlib import Path
 
+import pygame as pg
+
 
 ASSETS_PATH = Path(__file__).parent
 STARS_BACKGROUND_PATH = ASSETS_PATH / "stars.png"
@@ -11,3 +14,9 @@ START_MENU_PATH = ASSETS_PATH / "start.png"
 THEME_PATH = ASSETS_PATH / "theme.mp3"
 GRAPPLE_PATH = ASSETS_PATH / "grapple.mp3"
 WALKING_PATH = ASSETS_PATH / "walking.mp3"
+
+
+@lru_cache
+def load_sound(path: Path) -> pg.mixer.Sound:
+    """Decode a sound once, later calls share it."""
+    return pg.mixer.Sound(path)
@@ -0,0 +1,124 @@
+import logging
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+import pygame as pg
+
+logger = logging.getLogger(__name__)
+
+# Channels kept back for looping effects, one-shots never play on them.
+LOOP_CHANNELS = 2
+
+
+class AudioManager:
+    """
+    Plays music and sound effects.
+
+    Music is streamed from disk rather than decoded up front. Looping effects
+    each get one of a few reserved channels, and are only started or stopped
+    when they change state, so they can be asked for every frame. One-shot
+    effects don't play again until the previous play has finished.
+    """
+
+    _channels: Optional[list[pg.mixer.Channel]]
+
+    def __init__(
+        self,
+        loop_channels: int = LOOP_CHANNELS,
+        clock: Callable[[], float] = time.perf_counter,
+    ):
+        """
+        Args:
+            loop_channels: Channels reserved for looping effects.
+            clock: Seconds, for rate limiting one-shots.
+        """
+        self.loop_channels = loop_channels
+        self.clock = clock
+        # reserved once the mixer is up
+        self._channels = None
+        self._loops: dict[str, pg.mixer.Channel] = {}
+        self._last_played: dict[str, float] = {}
+        self._counts = {
+            "loop_starts": 0,
+            "loop_stops": 0,
+            "loops_unavailable": 0,
+            "one_shots": 0,
+            "one_shots_limited": 0,
+            "one_shots_dropped": 0,
+        }
+        self._peak_busy = 0
+
+    def _free_channel(self) -> Optional[pg.mixer.Channel]:
+        if self._channels is None:
+            pg.mixer.set_reserved(self.loop_channels)
+            self._channels = [pg.mixer.Channel(i) for i in range(self.loop_channels)]
+        in_use = set(self._loops.values())
+        return next((c for c in self._channels if c not in in_use), None)
+
+    def _sample_busy(self) -> None:
+        busy = sum(
+            pg.mixer.Channel(i).get_busy() for i in range(pg.mixer.get_num_channels())
+        )
+        self._peak_busy = max(self._peak_busy, busy)
+
+    def play_music(self, path: Path, volume: float = 1.0) -> None:
+        """Stream music from a file, looping forever."""
+        pg.mixer.music.load(path)
+        pg.mixer.music.set_volume(volume)
+        pg.mixer.music.play(loops=-1)
+
+    def start_loop(self, name: str, sound: pg.mixer.Sound) -> None:
+        """Loop a sound on a reserved channel, if it isn't already looping."""
+        if name in self._loops:
+            return
+        if (channel := self._free_channel()) is None:
+            self._counts["loops_unavailable"] += 1
+            logger.warning(f"no channel free to loop {name}")
+            return
+        channel.play(sound, loops=-1)
+        self._loops[name] = channel
+        self._counts["loop_starts"] += 1
+        self._sample_busy()
+
+    def stop_loop(self, name: str) -> None:
+        """Stop a looping sound, if it's looping."""
+        if (channel := self._loops.pop(name, None)) is None:
+            return
+        channel.stop()
+        self._counts["loop_stops"] += 1
+
+    def play_once(
+        self, name: str, sound: pg.mixer.Sound, min_interval: Optional[float] = None
+    ) -> None:
+        """
+        Play a sound once, unless it was played too recently.
+
+        Args:
+            name: Effect the sound is for, rate limited separately from others.
+            sound: The sound.
+            min_interval: Seconds between plays, the sound's length if not given.
+        """
+        now = self.clock()
+        interval = sound.get_length() if min_interval is None else min_interval
+        if now - self._last_played.get(name, -interval) < interval:
+            self._counts["one_shots_limited"] += 1
+            return
+        self._last_played[name] = now
+
+        if sound.play() is None:
+            self._counts["one_shots_dropped"] += 1
+            return
+        self._counts["one_shots"] += 1
+        self._sample_busy()
+
+    def stats(self) -> dict[str, int]:
+        """How many effects were played, skipped and are looping."""
+        return {
+            **self._counts,
+            "loops_active": len(self._loops),
+            "peak_channels_busy": self._peak_busy,
+        }
+
+
+audio_manager = AudioManager()
@@ -1,70 +1,134 @@
 from functools import lru_cache
+from typing import Optional
 
 import pygame
 import pygame as pg
 
 from ggj.assets import STARS_BACKGROUND_PATH, MARS_PATH
+from ggj.baked import load_baked
 from ggj.camera import Camera
+from ggj.canvas import Canvas
 from ggj.player import Player
 
-init_mars_pos = None
+STARS_ZINDEX = 3
+MARS_ZINDEX = 2
+
+STARS_SCALE = 1.8
+MARS_SCALE = 4
 
 
 @lru_cache
 def load_star_image() -> pg.Surface:
-    i = pg.image.load(STARS_BACKGROUND_PATH).convert()
-    return pygame.transform.scale_by(i, 1.8)
+    (stars,) = load_baked(
+        "stars",
+        STARS_BACKGROUND_PATH,
+        (STARS_SCALE,),
+        lambda i: [pygame.transform.scale_by(i.convert(), STARS_SCALE)],
+        alpha=False,
+    )
+    return stars
 
 
 @lru_cache
 def load_mars_image() -> pg.Surface:
-    i = pg.image.load(MARS_PATH).convert_alpha()
-    i = pygame.transform.scale_by(i, 4)
-    return i
-
-
-def apply_mars(screen: pygame.surface.Surface, camera: Camera, player: Player):
-    mars = load_mars_image()
-
-    global init_mars_pos
+    (mars,) = load_baked(
+        "mars",
+        MARS_PATH,
+        (MARS_SCALE,),
+        lambda i: [pygame.transform.scale_by(i.convert_alpha(), MARS_SCALE)],
+    )
+    return mars
+
+
+class ParallaxLayer:
+    """
+    An image drawn on one of the camera's parallax layers. Wrapped layers
+    repeat the image edge to edge forever in both directions.
+    """
+
+    def __init__(
+        self,
+        image: pg.Surface,
+        zindex: int,
+        origin: tuple[int, int] = (0, 0),
+        wrap: bool = False,
+    ):
+        """
+        Args:
+            image: What to draw.
+            zindex: Parallax layer, see camera.PARALLAX_LAYERS.
+            origin: World position of the (first copy of the) image.
+            wrap: Whether to tile the image across the whole screen.
+        """
+        self.image = image
+        self.zindex = zindex
+        self.origin = origin
+        self.wrap = wrap
+
+    def visible_rects(self, camera: Camera, stride: int = 1) -> list[pg.Rect]:
+        """
+        Screen rects of the copies of the image that cross the screen.
+
+        Args:
+            camera: Camera to draw with.
+            stride: Only include every nth copy of a wrapped image, in a
+                diagonal pattern.
+        """
+        screen = pg.Rect((0, 0), camera.transform.screen_size)
+        first = camera.get_screen_rect(
+            pg.Rect(self.origin, self.image.get_size()), zindex=self.zindex
+        )
+        if not self.wrap:
+            return [first] if first.colliderect(screen) else []
+
+        # copies sit edge to edge on screen, so work out which columns and
+        # rows of them overlap it
+        width, height = first.size
+        first_column = -first.x // width
+        last_column = (screen.width - 1 - first.x) // width
+        first_row = -first.y // height
+        last_row = (screen.height - 1 - first.y) // height
+
+        return [
+            pg.Rect(first.x + column * width, first.y + row * height, width, height)
+            for column in range(first_column, last_column + 1)
+            for row in range(first_row, last_row + 1)
+            if (column + row) % stride == 0
+        ]
+
+    def draw(self, canvas: Canvas, camera: Camera, stride: int = 1) -> None:
+        canvas.blits(
+            [(self.image, rect) for rect in self.visible_rects(camera, stride)]
+        )
+
+
+_mars_layer: Optional[ParallaxLayer] = None
+
+
+def apply_mars(canvas: Canvas, camera: Camera, player: Player):
+    global _mars_layer
+
+    if _mars_layer is None:
+        # mars starts out centered on the player, below the ground
+        mars = load_mars_image()
+        _mars_layer = ParallaxLayer(
+            mars,
+            MARS_ZINDEX,
+            origin=(
+                int(player.point_mass.position.x - mars.get_width() / 2),
+                int(mars.get_height() * 1.5),
+            ),
+        )
+
+    _mars_layer.draw(canvas, camera)
 
-    if init_mars_pos is None:
-        mars_rect = mars.get_rect()
-        mars_rect.x = int(player.point_mass.position.x - mars.get_width() / 2)
-        mars_rect.y += int(mars.get_height() * 1.5)
-        init_mars_pos = mars_rect
 
-    screen.blit(
-        mars,
-        camera.get_screen_rect(
-            init_mars_pos,
-            zindex=2,
-        ),
-    )
+@lru_cache
+def _star_layer() -> ParallaxLayer:
+    return ParallaxLayer(load_star_image(), STARS_ZINDEX, wrap=True)
 
 
 def apply_star_tiles(
-    screen: pygame.surface.Surface, camera: Camera, player: Player
+    canvas: Canvas, camera: Camera, player: Player, stride: int = 1
 ) -> None:
-    # TODO fix. This is a really bad function but works for now. The proper fix is to shrink parallax things.
-
-    star_image = load_star_image()
-    star_image.get_rect()
-    base_rect = star_image.get_rect()
-
-    # roughly estimate what tile we need start  at, just x for now, 0.5 as tiles move half speed when zindex=3
-    rough_tile_x = int(player.point_mass.position.x / star_image.get_width() * 0.5)
-
-    # 2xs as tiles are squished together by parallax so compensate
-    current_rect = star_image.get_rect()
-    for x in range(-8, 10):  # render some tiles around player
-        current_rect.x = base_rect.x + star_image.get_width() * (x + rough_tile_x) * 2
-        for y in range(-8, 10):
-            current_rect.y = base_rect.y + star_image.get_height() * y * 2
-            screen.blit(
-                star_image,
-                camera.get_screen_rect(
-                    current_rect,
-                    zindex=3,
-                ),
-            )
+    _star_layer().draw(canvas, camera, stride)
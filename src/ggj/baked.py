@@ -0,0 +1,148 @@
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+import pygame as pg
+
+from ggj.cache import cache_dir
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the layout of baked atlases changes so old ones are rebuilt
+# rather than misread.
+BAKED_ASSETS_VERSION = 1
+
+
+def bake_key(source: Path, params: tuple) -> str:
+    """
+    Key of the baked form of an image, which changes with the image's
+    contents, the parameters it's built with and the pygame doing the
+    scaling.
+    """
+    digest = hashlib.sha256(source.read_bytes())
+    digest.update(repr((BAKED_ASSETS_VERSION, pg.version.ver, params)).encode())
+    return digest.hexdigest()[:16]
+
+
+def pack_atlas(
+    frames: list[pg.Surface],
+) -> tuple[bytes, tuple[int, int], list[pg.Rect]]:
+    """
+    Stack frames top to bottom into one RGBA image, copying pixels as they
+    are rather than blending them.
+
+    Returns:
+        The atlas pixels, its size and where each frame is in it.
+    """
+    width = max(frame.get_width() for frame in frames)
+    height = sum(frame.get_height() for frame in frames)
+    pixels = np.zeros((height, width, 4), dtype=np.uint8)
+
+    rects = []
+    y = 0
+    for frame in frames:
+        w, h = frame.get_size()
+        rgba = pg.image.tobytes(frame, "RGBA")
+        pixels[y : y + h, :w] = np.frombuffer(rgba, dtype=np.uint8).reshape(h, w, 4)
+        rects.append(pg.Rect(0, y, w, h))
+        y += h
+
+    return pixels.tobytes(), (width, height), rects
+
+
+def _atlas_paths(directory: Path, name: str) -> tuple[Path, Path]:
+    return directory / f"{name}.rgba", directory / f"{name}.json"
+
+
+def _read_atlas(
+    directory: Path, name: str, key: str
+) -> tuple[bytes, tuple[int, int], list[pg.Rect]]:
+    pixels_path, manifest_path = _atlas_paths(directory, name)
+    manifest = json.loads(manifest_path.read_text())
+    if manifest["key"] != key:
+        raise ValueError(f"baked for {manifest['key']}, wanted {key}")
+
+    width, height = manifest["size"]
+    pixels = pixels_path.read_bytes()
+    if len(pixels) != width * height * 4:
+        raise ValueError(f"{len(pixels)} bytes of pixels for {width}x{height}")
+
+    return pixels, (width, height), [pg.Rect(r) for r in manifest["frames"]]
+
+
+def _write_atlas(
+    directory: Path,
+    name: str,
+    key: str,
+    pixels: bytes,
+    size: tuple[int, int],
+    rects: list[pg.Rect],
+) -> None:
+    pixels_path, manifest_path = _atlas_paths(directory, name)
+    manifest = {"key": key, "size": size, "frames": [tuple(r) for r in rects]}
+
+    # the manifest goes last, so it's never newer than the pixels it describes
+    writes = [(pixels_path, pixels), (manifest_path, json.dumps(manifest).encode())]
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        for path, data in writes:
+            tmp = path.with_suffix(f".{os.getpid()}.tmp")
+            try:
+                tmp.write_bytes(data)
+                os.replace(tmp, path)
+            finally:
+                tmp.unlink(missing_ok=True)
+    except OSError as e:
+        logger.warning(f"could not write baked {name} to {directory}: {e}")
+
+
+def load_baked(
+    name: str,
+    source: Path,
+    params: tuple,
+    build: Callable[[pg.Surface], list[pg.Surface]],
+    alpha: bool = True,
+) -> list[pg.Surface]:
+    """
+    Load frames made from an image, building them and baking them into an
+    atlas in the cache on a miss. A display mode has to be set.
+
+    Args:
+        name: Name of the atlas in the cache.
+        source: The image, its content hash is part of the atlas' key.
+        params: Everything else build depends on, like sizes and scales.
+        build: Makes the frames from the loaded image.
+        alpha: Whether the frames keep per pixel alpha, otherwise they're
+            converted to the opaque display format.
+
+    Returns:
+        The frames, as subsurfaces of the loaded atlas.
+    """
+    directory = cache_dir() / "assets"
+    key = bake_key(source, params)
+
+    try:
+        pixels, size, rects = _read_atlas(directory, name, key)
+    except FileNotFoundError:
+        logger.info(f"no baked {name} in {directory}, building from {source}")
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        logger.info(f"rebuilding baked {name}: {e}")
+    else:
+        return _frames(pixels, size, rects, alpha)
+
+    pixels, size, rects = pack_atlas(build(pg.image.load(source)))
+    _write_atlas(directory, name, key, pixels, size, rects)
+    return _frames(pixels, size, rects, alpha)
+
+
+def _frames(
+    pixels: bytes, size: tuple[int, int], rects: list[pg.Rect], alpha: bool
+) -> list[pg.Surface]:
+    atlas = pg.image.frombuffer(pixels, size, "RGBA")
+    # converting copies the pixels, so the atlas doesn't hold on to the buffer
+    atlas = atlas.convert_alpha() if alpha else atlas.convert()
+    return [atlas.subsurface(rect) for rect in rects]
@@ -0,0 +1,344 @@
+import argparse
+import json
+import logging
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+import numpy as np
+import pygame as pg
+
+from ggj.canvas import Canvas
+from ggj.constants import LOG_LEVEL, LOG_LEVELS, PHYSICS_HZ
+from ggj.headless import start_pygame
+from ggj.keys import InputState, key_manager, key_map
+from ggj.log import setup_logging
+from ggj.main import Game
+from ggj.map.importer import (
+    LOCATIONS,
+    WORLD_PNG_PATH,
+    compile_map,
+    compiled_world,
+    load_compiled_map,
+)
+from ggj.render import FullRenderer, Renderer
+from ggj.telegraph import POLE_COUNT
+from ggj.timings import frame_timer
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the layout of the results changes.
+BENCHMARK_VERSION = 1
+
+# Frames run before measuring anything, while the first chunks load.
+WARMUP_FRAMES = 30
+
+# Frames between poles in the poles scenario, all of them are placed within
+# POLE_COUNT * POLE_INTERVAL_FRAMES frames.
+POLE_INTERVAL_FRAMES = 4
+
+# Widths of the synthetic maps in blocks, world.png is 2000 wide.
+SYNTHETIC_WIDTHS = (2000, 8000, 32000)
+SYNTHETIC_HEIGHT = 80
+
+# p95 frame time over the baseline's that counts as a regression.
+REGRESSION_TOLERANCE = 1.15
+
+# map pixels, see map/map.md
+_SURFACE = 0x00
+_MOCK = 0xF0
+_SKY = 0xFF
+
+NO_INPUT = InputState(frozenset(), frozenset(), False, None, None, None)
+
+# Input for a frame of a scenario, given the frame number and the game.
+Script = Callable[[int, Game], InputState]
+
+
+def _idle(frame: int, game: Game) -> InputState:
+    return NO_INPUT
+
+
+def _walk(frame: int, game: Game) -> InputState:
+    # jumping all the way, to get over walls
+    return NO_INPUT._replace(
+        key_down=frozenset({key_map.player_right, key_map.player_jump})
+    )
+
+
+def _grapple(frame: int, game: Game) -> InputState:
+    # hooked onto the ground ahead, which drags the player along
+    x, y = game.player.rect.center
+    return _walk(frame, game)._replace(mouse_left_down_pos=(x + 300, y + 150))
+
+
+def _poles(frame: int, game: Game) -> InputState:
+    state = _walk(frame, game)
+    if frame % POLE_INTERVAL_FRAMES == 0 and frame // POLE_INTERVAL_FRAMES < POLE_COUNT:
+        # the pole hangs down from here onto the ground in front
+        x, y = game.player.rect.center
+        state = state._replace(mouse_right_up_pos=(x + 100, y))
+    return state
+
+
+SCENARIOS: dict[str, Script] = {
+    "idle": _idle,
+    "walk": _walk,
+    "grapple": _grapple,
+    "poles": _poles,
+}
+
+
+def synthetic_map(width: int, height: int = SYNTHETIC_HEIGHT) -> np.ndarray:
+    """
+    World array of rolling ground with ledges above it, laid out like
+    world.png and with room for the player to start in the same place.
+
+    Args:
+        width: Width in blocks.
+        height: Height in blocks, the ground is near the bottom.
+    """
+    x = np.arange(width)
+    ground = (height - 12 + 4 * np.sin(x / 40) + 2 * np.sin(x / 13)).astype(int)
+    # blocks go down to the lower neighbour's height, so slopes have no gaps
+    lowest = np.maximum(ground, np.maximum(np.roll(ground, 1), np.roll(ground, -1)))
+
+    rows = np.arange(height)[:, np.newaxis]
+    w_array = np.full((height, width), _SKY, dtype=np.uint8)
+    w_array[rows > lowest] = _MOCK
+    w_array[(rows >= ground) & (rows <= lowest)] = _SURFACE
+
+    # a ledge every 50 blocks to grapple onto
+    for start in range(20, width - 8, 50):
+        w_array[ground[start] - 8, start : start + 8] = _SURFACE
+
+    # every location somewhere along the top
+    for value, column in zip(LOCATIONS, np.linspace(0, width - 1, len(LOCATIONS))):
+        w_array[0, int(column)] = value
+
+    return w_array
+
+
+def _run_frame(game: Game, renderer: Renderer, script: Script, frame: int) -> None:
+    key_manager.update()
+    key_manager.restore(script(frame, game))
+    frame_timer.lap("input")
+    alpha = game.advance(1.0 / PHYSICS_HZ)
+    renderer.draw_game(game, alpha)
+
+
+def _summary(values: np.ndarray) -> dict[str, float]:
+    p50, p95, p99 = np.percentile(values, (50, 95, 99))
+    return {
+        "mean": float(values.mean()),
+        "p50": float(p50),
+        "p95": float(p95),
+        "p99": float(p99),
+        "max": float(values.max()),
+    }
+
+
+def measure(
+    canvas: Canvas,
+    compiled_map: dict[str, np.ndarray],
+    script: Script,
+    frames: int,
+    warmup: int = WARMUP_FRAMES,
+) -> dict[str, Any]:
+    """
+    Run a scripted game a step and a draw per frame, as fast as possible.
+
+    The game is run twice, once timed and once with tracemalloc, so tracing
+    allocations doesn't slow down the timed run.
+
+    Args:
+        canvas: What to draw on.
+        compiled_map: Map to play on.
+        script: Input for each frame.
+        frames: Frames measured, after the warmup.
+        warmup: Frames run before measuring.
+    """
+    renderer = FullRenderer(canvas)
+
+    game = Game(canvas, seed=0, compiled_map=compiled_map)
+    frame_timer.enabled = True
+    frame_seconds = np.zeros(frames)
+    for i in range(warmup + frames):
+        if i == warmup:
+            frame_timer.clear()
+        start = time.perf_counter()
+        frame_timer.start_frame()
+        _run_frame(game, renderer, script, i)
+        frame_timer.end_frame()
+        if i >= warmup:
+            frame_seconds[i - warmup] = time.perf_counter() - start
+    frame_timer.enabled = False
+    stages = frame_timer.stats()
+    game.shutdown()
+
+    # bytes allocated on top of what was live at the start of each frame, at
+    # the frame's high point
+    game = Game(canvas, seed=0, compiled_map=compiled_map)
+    allocated = np.zeros(frames)
+    live_after_warmup = 0
+    tracemalloc.start()
+    for i in range(warmup + frames):
+        if i == warmup:
+            live_after_warmup, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        _run_frame(game, renderer, script, i)
+        _, peak = tracemalloc.get_traced_memory()
+        if i >= warmup:
+            allocated[i - warmup] = peak - before
+    live_at_end, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    game.shutdown()
+
+    return {
+        "frames": frames,
+        "frame_ms": _summary(frame_seconds * 1000.0),
+        "stage_p50_ms": {
+            stage: stats["p50"]
+            for stage, stats in stages.items()
+            if stage != "frame" and stats["p99"] > 0
+        },
+        "alloc_kib_per_frame": _summary(allocated / 1024.0),
+        "retained_kib": (live_at_end - live_after_warmup) / 1024.0,
+    }
+
+
+def time_map_import(png_path: Path = WORLD_PNG_PATH) -> dict[str, float]:
+    """Milliseconds to import a map with nothing cached, then from the cache."""
+    times = {}
+    with tempfile.TemporaryDirectory() as cache_directory:
+        for name in ("cold", "warm"):
+            start = time.perf_counter()
+            load_compiled_map(png_path, Path(cache_directory))
+            times[name] = (time.perf_counter() - start) * 1000.0
+    return times
+
+
+def compare(
+    results: list[dict[str, Any]],
+    baseline: list[dict[str, Any]],
+    tolerance: float = REGRESSION_TOLERANCE,
+) -> list[str]:
+    """
+    Compare p95 frame times against an earlier run.
+
+    Returns:
+        Description of every map and scenario that got slower than tolerance
+        allows.
+    """
+    before = {(r["map"], r["scenario"]): r for r in baseline}
+    regressions = []
+    for result in results:
+        if (old := before.get((result["map"], result["scenario"]))) is None:
+            continue
+        ratio = result["frame_ms"]["p95"] / old["frame_ms"]["p95"]
+        if ratio > tolerance:
+            regressions.append(
+                f"{result['map']} {result['scenario']}: p95 "
+                f"{old['frame_ms']['p95']:.3f}ms -> {result['frame_ms']['p95']:.3f}ms"
+            )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Time scripted scenarios on the real map and bigger synthetic ones."
+    )
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=SCENARIOS,
+        help="run only this scenario, can be repeated",
+    )
+    parser.add_argument(
+        "--widths",
+        type=int,
+        nargs="*",
+        default=SYNTHETIC_WIDTHS,
+        help="widths of the synthetic maps in blocks",
+    )
+    parser.add_argument("--output", type=Path, default=Path("ggj-benchmark.json"))
+    parser.add_argument(
+        "--baseline", type=Path, help="results of an earlier run to compare with"
+    )
+    parser.add_argument("--tolerance", type=float, default=REGRESSION_TOLERANCE)
+    args = parser.parse_args()
+    setup_logging(Path("ggj.log"), LOG_LEVEL, LOG_LEVELS)
+
+    baseline: Optional[list[dict[str, Any]]] = None
+    if args.baseline is not None:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+
+    map_import_ms = time_map_import()
+    print(
+        f"world.png import cold {map_import_ms['cold']:.1f}ms  "
+        f"warm {map_import_ms['warm']:.1f}ms"
+    )
+
+    canvas = start_pygame()
+    maps = {"world.png": compiled_world()}
+    for width in args.widths:
+        maps[f"synthetic-{width}x{SYNTHETIC_HEIGHT}"] = compile_map(
+            synthetic_map(width)
+        )
+
+    results = []
+    for map_name, compiled in maps.items():
+        blocks = len(compiled["surface_blocks"])
+        for scenario in args.scenario or SCENARIOS:
+            logger.info(f"benchmarking {scenario} on {map_name}")
+            result = {
+                "map": map_name,
+                "blocks": blocks,
+                "scenario": scenario,
+                **measure(canvas, compiled, SCENARIOS[scenario], args.frames),
+            }
+            results.append(result)
+
+            frame_ms = result["frame_ms"]
+            print(
+                f"{map_name:<22} {scenario:<8} {blocks:>7} blocks  "
+                f"mean {frame_ms['mean']:.3f}ms  p95 {frame_ms['p95']:.3f}ms  "
+                f"p99 {frame_ms['p99']:.3f}ms  "
+                f"alloc {result['alloc_kib_per_frame']['mean']:.1f}KiB/frame"
+            )
+
+    with open(args.output, "w") as f:
+        json.dump(
+            {
+                "version": BENCHMARK_VERSION,
+                "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                "python": platform.python_version(),
+                "pygame": pg.version.ver,
+                "platform": platform.platform(),
+                "map_import_ms": map_import_ms,
+                "results": results,
+            },
+            f,
+            indent=2,
+        )
+    print(f"wrote {args.output}")
+    pg.quit()
+
+    if baseline is not None:
+        if regressions := compare(results, baseline, args.tolerance):
+            print("slower than the baseline:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print(f"no regressions against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,16 @@
+import os
+from pathlib import Path
+
+
+def cache_dir() -> Path:
+    """
+    Directory used for compiled artifacts (maps, baked assets).
+
+    Can be overridden with GGJ_CACHE_DIR, otherwise follows XDG_CACHE_HOME.
+    """
+    if (override := os.environ.get("GGJ_CACHE_DIR")) is not None:
+        return Path(override)
+
+    xdg_cache = os.environ.get("XDG_CACHE_HOME")
+    base = Path(xdg_cache) if xdg_cache else Path.home() / ".cache"
+    return base / "ggj"
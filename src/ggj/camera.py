@@ -1,5 +1,6 @@
+import numpy as np
 import pygame as pg
-from typing import Optional, cast
+from typing import NamedTuple, Optional
 import logging
 
 from ggj import game_object
@@ -23,29 +24,58 @@ PARALLAX_LAYERS: dict[int, pg.Vector2] = {
 }
 
 
+class CameraTransform(NamedTuple):
+    """
+    Everything needed to turn world coordinates into screen coordinates for
+    one frame. A screen coordinate on a parallax layer is
+    int(world * parallax + offset) + screen_center.
+    """
+
+    screen_size: tuple[int, int]
+    screen_center: tuple[int, int]
+    # world position the center of the screen is looking at
+    center: tuple[float, float]
+    # per parallax layer, (parallax_x, parallax_y, offset_x, offset_y)
+    layers: dict[int, tuple[float, float, float, float]]
+
+
+def _make_transform(
+    screen_size: tuple[int, int], center: tuple[float, float]
+) -> CameraTransform:
+    return CameraTransform(
+        screen_size,
+        (round(screen_size[0] / 2.0), round(screen_size[1] / 2.0)),
+        center,
+        {
+            z: (p.x, p.y, -center[0] * p.x, -center[1] * p.y)
+            for z, p in PARALLAX_LAYERS.items()
+        },
+    )
+
+
 class Camera(game_object.GameObject):
     # Bounding box to follow the object being followed.
     # This is defined in world coordinates.
     player_box: pg.Rect
     follow_object: Optional[game_object.GameObject]
+    # Center of the player box before the last update, things are drawn
+    # relative to somewhere between that and the current center.
+    _previous_center: pg.Vector2
+    # Size of the screen, only changes when the window is resized.
+    _screen_size: tuple[int, int]
+    # Snapshot used for drawing, rebuilt when the camera moves.
+    transform: CameraTransform
 
     def __init__(self) -> None:
         self.player_box = pg.Rect(0, 0, *CAMERA_COLLIDE_BOUNDS)
+        self._previous_center = pg.Vector2(self.player_box.center)
+        self._screen_size = BASE_RESOLUTION
+        self.transform = _make_transform(self._screen_size, self.player_box.center)
 
-    def _get_relative(self, position: pg.Vector3) -> pg.Vector2:
-        """
-        Get object coordinates relative to the camera's position
-
-        Args:
-            position: The (x,y,z) coordinates of the character to get relative.
-                to the camera.
-        """
-        # zindex 1 should be at index 1 in the
-        if position.z not in PARALLAX_LAYERS:
-            raise ValueError(f"parallax index {position.z} is not supported")
-
-        pos_vec2 = pg.Vector2(position.x, position.y) - self.player_box.center
-        return pos_vec2.elementwise() * PARALLAX_LAYERS[cast(int, position.z)]
+    def resize(self, screen_size: tuple[int, int]) -> None:
+        """Must be called when the size of the screen changes."""
+        self._screen_size = (int(screen_size[0]), int(screen_size[1]))
+        self.transform = _make_transform(self._screen_size, self.transform.center)
 
     def get_screen_rect(self, rect: pg.Rect, zindex=1) -> pg.Rect:
         """
@@ -58,33 +88,59 @@ class Camera(game_object.GameObject):
                 an object is closer to the screen. Higher values means an
                 object is further away.
         """
-        relative_cam = self._get_relative(pg.Vector3(rect.x, rect.y, zindex))
-        relative_rect = pg.Rect(
-            (relative_cam.x, relative_cam.y, rect.width, rect.height)
-        )
+        transform = self.transform
+        if (layer := transform.layers.get(zindex)) is None:
+            raise ValueError(f"parallax index {zindex} is not supported")
+
         # center of the camera represents the center of the screen.
-        window = pg.display.Info()
-        width, height = (window.current_w, window.current_h)
-        relative_rect.center = (
-            relative_rect.center[0] + round(width / 2.0),
-            relative_rect.center[1] + round(height / 2.0),
+        parallax_x, parallax_y, offset_x, offset_y = layer
+        return pg.Rect(
+            int(rect.x * parallax_x + offset_x) + transform.screen_center[0],
+            int(rect.y * parallax_y + offset_y) + transform.screen_center[1],
+            rect.width,
+            rect.height,
         )
-        return relative_rect
+
+    def get_screen_rects(self, rects: np.ndarray, zindex=1) -> np.ndarray:
+        """
+        Batch version of get_screen_rect.
+
+        Args:
+            rects: (N, 4) array of (x, y, width, height) world rects.
+            zindex: The zindex all of the rects exist in.
+
+        Returns:
+            (N, 4) int array of screen rects.
+        """
+        transform = self.transform
+        if (layer := transform.layers.get(zindex)) is None:
+            raise ValueError(f"parallax index {zindex} is not supported")
+
+        rects = np.asarray(rects)
+        parallax_x, parallax_y, offset_x, offset_y = layer
+        screen_rects = np.empty((len(rects), 4), dtype=np.int64)
+        screen_rects[:, 0] = np.trunc(rects[:, 0] * parallax_x + offset_x)
+        screen_rects[:, 1] = np.trunc(rects[:, 1] * parallax_y + offset_y)
+        screen_rects[:, :2] += transform.screen_center
+        screen_rects[:, 2:] = rects[:, 2:]
+        return screen_rects
 
     @property
     def world_rect(self) -> pg.Rect:
-        window = pg.display.Info()
-        return screen_to_world_rect(pg.Rect(0, 0, window.current_w, window.current_h))
+        return screen_to_world_rect(pg.Rect(0, 0, *self._screen_size))
 
     def follow(self, obj: game_object.GameObject):
         self.follow_object = obj
         self.player_box.center = obj.world_rect.center
+        self._previous_center = pg.Vector2(self.player_box.center)
+        self.transform = _make_transform(self._screen_size, self.player_box.center)
 
     def update(self):
         if not self.follow_object:
             return
 
         follow_rect = self.follow_object.world_rect
+        self._previous_center = pg.Vector2(self.player_box.center)
 
         # Ensure the follower's center is always at the bottom midle of the viewport.
         if not self.player_box.collidepoint(
@@ -100,11 +156,18 @@ class Camera(game_object.GameObject):
             elif follow_rect.center[1] < self.player_box.top:
                 self.player_box.top = follow_rect.centery
 
+        self.transform = _make_transform(self._screen_size, self.player_box.center)
+
+    def interpolate(self, alpha: float) -> None:
+        """Draw from somewhere between the last two updates."""
+        center = self._previous_center.lerp(self.player_box.center, alpha)
+        self.transform = _make_transform(self._screen_size, (center.x, center.y))
+
     def get_view_port(self) -> pg.Rect:
-        window = pg.display.Info()
-        top_left = self.player_box.centerx - (window.current_w / 2)
-        top_right = self.player_box.centery - (window.current_h / 2)
-        return pg.Rect(top_left, top_right, window.current_w, window.current_h)
+        width, height = self._screen_size
+        top_left = self.player_box.centerx - (width / 2)
+        top_right = self.player_box.centery - (height / 2)
+        return pg.Rect(top_left, top_right, width, height)
 
 
 camera = Camera()
@@ -0,0 +1,335 @@
+import logging
+import os
+import weakref
+from typing import Iterable, Optional, Protocol, Sequence, Union
+
+import pygame as pg
+from pygame._sdl2 import video
+
+logger = logging.getLogger(__name__)
+
+# where to blit an image, either a top left or a rect whose size is ignored
+Dest = Union[pg.Rect, tuple[int, int], list[int]]
+Color = Union[pg.Color, tuple[int, int, int], tuple[int, int, int, int], str]
+
+SOFTWARE_BACKEND = "software"
+GPU_BACKEND = "gpu"
+
+
+class Canvas(Protocol):
+    """
+    Something to draw a frame on. Mirrors the bits of pg.Surface and pg.draw
+    the game uses, so drawing code doesn't care if it ends up in a software
+    surface or on the GPU.
+    """
+
+    def get_size(self) -> tuple[int, int]: ...
+
+    def get_rect(self) -> pg.Rect: ...
+
+    def fill(self, color: Color) -> None: ...
+
+    def blit(self, image: pg.Surface, dest: Dest, version: int = 0) -> None:
+        """
+        Args:
+            image: What to draw.
+            dest: Where to draw it.
+            version: Bump this whenever the contents of image change.
+        """
+        ...
+
+    def blits(self, blits: Sequence[tuple[pg.Surface, Dest]]) -> None: ...
+
+    def draw_line(self, color: Color, start: Dest, end: Dest) -> None: ...
+
+    def draw_rect(self, color: Color, rect: pg.Rect) -> None: ...
+
+    def preload(self, images: Iterable[pg.Surface]) -> None:
+        """Get images ready to draw ahead of time, to avoid hitches later."""
+        ...
+
+    def present(self, rects: Optional[Sequence[pg.Rect]] = None) -> None:
+        """
+        Show everything drawn so far in the window.
+
+        Args:
+            rects: Only these areas have changed since the last present, if
+                given. Backends are free to show everything anyway.
+        """
+        ...
+
+
+class WindowCanvas(Canvas, Protocol):
+    """
+    A canvas that ends up in the window. It's drawn at a fixed resolution and
+    scaled to fit the window, so the cost of drawing doesn't depend on the
+    window size.
+    """
+
+    resolution: tuple[int, int]
+    # smooth filtering when scaling to the window
+    smooth: bool
+
+    def resize(self, window_size: tuple[int, int]) -> None:
+        """Called when the window changes size."""
+        ...
+
+    def set_resolution(self, resolution: tuple[int, int]) -> None: ...
+
+    def window_to_canvas(self, pos: tuple[int, int]) -> tuple[int, int]:
+        """Map a position in the window, like the mouse, onto the canvas."""
+        ...
+
+
+def fit_rect(size: tuple[int, int], window_size: tuple[int, int]) -> pg.Rect:
+    """Largest rect with the aspect ratio of size centered in the window."""
+    scale = min(window_size[0] / size[0], window_size[1] / size[1])
+    rect = pg.Rect(0, 0, round(size[0] * scale), round(size[1] * scale))
+    rect.center = (window_size[0] // 2, window_size[1] // 2)
+    return rect
+
+
+def _window_to_canvas(
+    pos: tuple[int, int], size: tuple[int, int], window_size: tuple[int, int]
+) -> tuple[int, int]:
+    viewport = fit_rect(size, window_size)
+    return (
+        int((pos[0] - viewport.x) * size[0] / viewport.width),
+        int((pos[1] - viewport.y) * size[1] / viewport.height),
+    )
+
+
+def _top_left(dest: Dest) -> tuple[int, int]:
+    if isinstance(dest, pg.Rect):
+        return dest.topleft
+    return dest[0], dest[1]
+
+
+class SurfaceCanvas(Canvas):
+    """Draws with software blits onto an offscreen surface."""
+
+    def __init__(self, surface: pg.Surface):
+        self.surface = surface
+
+    def get_size(self) -> tuple[int, int]:
+        return self.surface.get_size()
+
+    def get_rect(self) -> pg.Rect:
+        return self.surface.get_rect()
+
+    def fill(self, color: Color) -> None:
+        self.surface.fill(color)
+
+    def blit(self, image: pg.Surface, dest: Dest, version: int = 0) -> None:
+        self.surface.blit(image, dest)
+
+    def blits(self, blits: Sequence[tuple[pg.Surface, Dest]]) -> None:
+        self.surface.blits(blits, doreturn=False)
+
+    def draw_line(self, color: Color, start: Dest, end: Dest) -> None:
+        pg.draw.line(self.surface, color, _top_left(start), _top_left(end))
+
+    def draw_rect(self, color: Color, rect: pg.Rect) -> None:
+        pg.draw.rect(self.surface, color, rect)
+
+    def preload(self, images: Iterable[pg.Surface]) -> None:
+        pass
+
+    def present(self, rects: Optional[Sequence[pg.Rect]] = None) -> None:
+        pass
+
+
+class DisplayCanvas(SurfaceCanvas, WindowCanvas):
+    """
+    Draws with software blits for the display. When the resolution matches
+    the window size the display surface is drawn to directly, otherwise an
+    offscreen surface is scaled up to it once per frame.
+    """
+
+    def __init__(self, resolution: tuple[int, int]):
+        self.window = pg.display.get_surface()
+        # use a smooth filter when scaling up, slower
+        self.smooth = False
+        self.set_resolution(resolution)
+
+    def set_resolution(self, resolution: tuple[int, int]) -> None:
+        self.resolution = resolution
+        self._fit()
+
+    def resize(self, window_size: tuple[int, int]) -> None:
+        # pygame resizes the display surface by itself
+        self.window = pg.display.get_surface()
+        self._fit()
+
+    def _fit(self) -> None:
+        if self.window.get_size() == self.resolution:
+            self.surface = self.window
+            return
+
+        logger.info(
+            f"rendering at {self.resolution} scaled to {self.window.get_size()}"
+        )
+        self.surface = pg.Surface(self.resolution).convert(self.window)
+        self._viewport = fit_rect(self.resolution, self.window.get_size())
+        # black bars around the scaled frame, they're never drawn over
+        self.window.fill((0, 0, 0))
+
+    @property
+    def scaled(self) -> bool:
+        return self.surface is not self.window
+
+    def window_to_canvas(self, pos: tuple[int, int]) -> tuple[int, int]:
+        if not self.scaled:
+            return pos
+        return _window_to_canvas(pos, self.resolution, self.window.get_size())
+
+    def present(self, rects: Optional[Sequence[pg.Rect]] = None) -> None:
+        if self.scaled:
+            scale = pg.transform.smoothscale if self.smooth else pg.transform.scale
+            scale(
+                self.surface,
+                self._viewport.size,
+                self.window.subsurface(self._viewport),
+            )
+            pg.display.flip()
+        elif rects is None:
+            pg.display.flip()
+        else:
+            pg.display.update(rects)
+
+
+class TextureCanvas(WindowCanvas):
+    """
+    Draws with an SDL renderer. Surfaces are uploaded as textures the first
+    time they're drawn and the textures are kept for as long as the surfaces
+    are alive. SDL scales the frame to the window.
+    """
+
+    def __init__(
+        self,
+        renderer: video.Renderer,
+        window: video.Window,
+        resolution: tuple[int, int],
+    ):
+        self.renderer = renderer
+        self.window = window
+        self.set_resolution(resolution)
+        self._textures: weakref.WeakKeyDictionary[
+            pg.Surface, tuple[int, video.Texture]
+        ] = weakref.WeakKeyDictionary()
+        self.uploads = 0
+        self._smooth = False
+
+    @property
+    def smooth(self) -> bool:
+        return self._smooth
+
+    @smooth.setter
+    def smooth(self, smooth: bool) -> None:
+        if smooth == self._smooth:
+            return
+        # SDL picks the filter when a texture is created, from the environment
+        # if the hint isn't set, so everything has to be uploaded again
+        self._smooth = smooth
+        os.environ["SDL_RENDER_SCALE_QUALITY"] = "linear" if smooth else "nearest"
+        self._textures.clear()
+
+    def _texture(self, image: pg.Surface, version: int) -> video.Texture:
+        cached = self._textures.get(image)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        texture = video.Texture.from_surface(self.renderer, image)
+        self._textures[image] = (version, texture)
+        self.uploads += 1
+        return texture
+
+    def set_resolution(self, resolution: tuple[int, int]) -> None:
+        self.resolution = resolution
+        self.renderer.logical_size = resolution
+
+    def resize(self, window_size: tuple[int, int]) -> None:
+        pass
+
+    def window_to_canvas(self, pos: tuple[int, int]) -> tuple[int, int]:
+        width, height = self.window.size
+        return _window_to_canvas(pos, self.resolution, (width, height))
+
+    def get_size(self) -> tuple[int, int]:
+        return self.resolution
+
+    def get_rect(self) -> pg.Rect:
+        return pg.Rect((0, 0), self.resolution)
+
+    def fill(self, color: Color) -> None:
+        self.renderer.draw_color = pg.Color(color)
+        self.renderer.clear()
+
+    def blit(self, image: pg.Surface, dest: Dest, version: int = 0) -> None:
+        self.renderer.blit(
+            self._texture(image, version), pg.Rect(_top_left(dest), image.get_size())
+        )
+
+    def blits(self, blits: Sequence[tuple[pg.Surface, Dest]]) -> None:
+        for image, dest in blits:
+            self.blit(image, dest)
+
+    def draw_line(self, color: Color, start: Dest, end: Dest) -> None:
+        self.renderer.draw_color = pg.Color(color)
+        self.renderer.draw_line(_top_left(start), _top_left(end))
+
+    def draw_rect(self, color: Color, rect: pg.Rect) -> None:
+        self.renderer.draw_color = pg.Color(color)
+        self.renderer.fill_rect(rect)
+
+    def preload(self, images: Iterable[pg.Surface]) -> None:
+        for image in images:
+            self._texture(image, 0)
+        logger.debug("%d textures uploaded", self.uploads)
+
+    def present(self, rects: Optional[Sequence[pg.Rect]] = None) -> None:
+        self.renderer.present()
+
+
+def make_canvas(
+    backend: str,
+    size: tuple[int, int],
+    caption: str,
+    resolution: Optional[tuple[int, int]] = None,
+) -> WindowCanvas:
+    """
+    Open the game window.
+
+    Args:
+        backend: SOFTWARE_BACKEND or GPU_BACKEND, the GPU backend falls back
+            to software if it can't be set up.
+        size: Initial window size.
+        caption: Window title.
+        resolution: Resolution to draw at, the window size if not given.
+    """
+    resolution = resolution or size
+    if backend == GPU_BACKEND:
+        try:
+            return _make_texture_canvas(size, caption, resolution)
+        except pg.error as e:
+            logger.warning(f"couldn't set up the gpu backend, using software: {e}")
+    elif backend != SOFTWARE_BACKEND:
+        logger.warning(f"unknown render backend {backend}, using software")
+
+    pg.display.set_mode(size, pg.RESIZABLE)
+    pg.display.set_caption(caption)
+    return DisplayCanvas(resolution)
+
+
+def _make_texture_canvas(
+    size: tuple[int, int], caption: str, resolution: tuple[int, int]
+) -> TextureCanvas:
+    # images are converted to the display format when they're loaded, which
+    # needs a display mode even though nothing is drawn to it
+    pg.display.set_mode((1, 1), pg.HIDDEN)
+
+    window = video.Window(caption, size, resizable=True)
+    # prefers a hardware renderer, SDL falls back to its software one
+    renderer = video.Renderer(window)
+    logger.info("rendering with the gpu backend")
+    return TextureCanvas(renderer, window, resolution)
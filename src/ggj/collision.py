@@ -1,6 +1,94 @@
-from typing import Optional
+import math
+from typing import Iterator, Optional, cast
 import pygame as pg
-from pygame.time import wait
+
+from ggj.game_object import GameObject
+from ggj.tilemap import TileMap
+
+# Width and height of a spatial index cell in world pixels.
+GRID_CELL_SIZE = 128
+
+
+class SpatialIndex:
+    """
+    Uniform grid over the world rects of sprites, so queries only look at
+    sprites in nearby cells instead of every sprite in a group.
+
+    The world rect of a sprite is captured when it is added, sprites that
+    move have to be removed and added again.
+    """
+
+    _cells: dict[tuple[int, int], list[pg.sprite.Sprite]]
+    _rects: dict[pg.sprite.Sprite, pg.Rect]
+
+    def __init__(self, cell_size: int = GRID_CELL_SIZE):
+        self.cell_size = cell_size
+        self._cells = {}
+        self._rects = {}
+
+    def __len__(self) -> int:
+        return len(self._rects)
+
+    def _cell_keys(self, rect: pg.Rect) -> Iterator[tuple[int, int]]:
+        for x in range(
+            rect.left // self.cell_size, (rect.right - 1) // self.cell_size + 1
+        ):
+            for y in range(
+                rect.top // self.cell_size, (rect.bottom - 1) // self.cell_size + 1
+            ):
+                yield x, y
+
+    def add(self, *sprites: pg.sprite.Sprite) -> None:
+        for sprite in sprites:
+            if sprite in self._rects:
+                continue
+            rect = self._rects[sprite] = cast(GameObject, sprite).world_rect
+            for key in self._cell_keys(rect):
+                self._cells.setdefault(key, []).append(sprite)
+
+    def remove(self, *sprites: pg.sprite.Sprite) -> None:
+        for sprite in sprites:
+            if (rect := self._rects.pop(sprite, None)) is None:
+                continue
+            for key in self._cell_keys(rect):
+                cell = self._cells[key]
+                cell.remove(sprite)
+                if not cell:
+                    del self._cells[key]
+
+    def query_rect(self, rect: pg.Rect) -> list[pg.sprite.Sprite]:
+        """Sprites whose world rect overlaps rect."""
+        # dict rather than set so results come back in a stable order
+        found: dict[pg.sprite.Sprite, None] = {}
+        for key in self._cell_keys(rect):
+            for sprite in self._cells.get(key, ()):
+                if sprite not in found and self._rects[sprite].colliderect(rect):
+                    found[sprite] = None
+        return list(found)
+
+    def query_point(self, point: pg.Vector2) -> list[pg.sprite.Sprite]:
+        """Sprites whose world rect contains point."""
+        x, y = math.floor(point[0]), math.floor(point[1])
+        cell = self._cells.get((x // self.cell_size, y // self.cell_size), ())
+        return [s for s in cell if self._rects[s].collidepoint(x, y)]
+
+    def query_radius(self, center: pg.Vector2, radius: float) -> list[pg.sprite.Sprite]:
+        """Sprites whose world rect is at least partly within radius of center."""
+        bounds = pg.Rect(
+            math.floor(center[0] - radius),
+            math.floor(center[1] - radius),
+            math.ceil(radius * 2) + 1,
+            math.ceil(radius * 2) + 1,
+        )
+        found = []
+        for sprite in self.query_rect(bounds):
+            rect = self._rects[sprite]
+            # closest point of the rect to the center
+            dx = max(rect.left - center[0], 0, center[0] - rect.right)
+            dy = max(rect.top - center[1], 0, center[1] - rect.bottom)
+            if dx * dx + dy * dy <= radius * radius:
+                found.append(sprite)
+        return found
 
 
 class CollisionObjects:
@@ -9,37 +97,53 @@ class CollisionObjects:
     # contains a mapping between the type that is in the group
     # and a group that the player can collide with.
     objects: dict[type, pg.sprite.Group]
+    # spatial index over each group's world rects
+    indexes: dict[type, SpatialIndex]
+    # solid tiles of the map, for grid aligned collision checks
+    tilemap: Optional[TileMap]
 
     def __init__(self):
         self.objects = {}
+        self.indexes = {}
+        self.tilemap = None
 
     def get(self, t: type) -> Optional[pg.sprite.Group]:
         return self.objects.get(t)
 
     def register(self, t: type, sprite_group: pg.sprite.Group) -> None:
         self.objects[t] = sprite_group
+        index = self.indexes[t] = SpatialIndex()
+        index.add(*sprite_group)
 
+    def register_tilemap(self, tilemap: TileMap) -> None:
+        self.tilemap = tilemap
 
-collision_object_manager = CollisionObjects()
+    def add(self, t: type, *sprites: pg.sprite.Sprite) -> None:
+        """Add sprites to a registered group, keeping its index up to date."""
+        self.objects[t].add(*sprites)
+        self.indexes[t].add(*sprites)
 
+    def remove(self, t: type, *sprites: pg.sprite.Sprite) -> None:
+        """Remove sprites from a registered group and its index."""
+        self.objects[t].remove(*sprites)
+        self.indexes[t].remove(*sprites)
 
-def point_collide_group(
-    point: pg.Vector2, group: pg.sprite.Group
-) -> list[pg.sprite.Sprite]:
-    """Utility method for checking if a single point collides a group"""
+    def query_rect(self, t: type, rect: pg.Rect) -> list[pg.sprite.Sprite]:
+        if (index := self.indexes.get(t)) is None:
+            return []
+        return index.query_rect(rect)
 
-    class DummySprite(pg.sprite.Sprite):
-        """DummySprite that we can use to check for a collision"""
+    def query_point(self, t: type, point: pg.Vector2) -> list[pg.sprite.Sprite]:
+        if (index := self.indexes.get(t)) is None:
+            return []
+        return index.query_point(point)
 
-        MOUSE_SIZE = (4, 4)
+    def query_radius(
+        self, t: type, center: pg.Vector2, radius: float
+    ) -> list[pg.sprite.Sprite]:
+        if (index := self.indexes.get(t)) is None:
+            return []
+        return index.query_radius(center, radius)
 
-        def __init__(self, *_: pg.sprite.Group):
-            super().__init__()
-            self.image = pg.Surface(DummySprite.MOUSE_SIZE)
-            self.rect = pg.Rect(
-                point.x,
-                point.y - DummySprite.MOUSE_SIZE[1] / 2,
-                *DummySprite.MOUSE_SIZE,
-            )
 
-    return pg.sprite.spritecollide(DummySprite(), group, False)
+collision_object_manager = CollisionObjects()
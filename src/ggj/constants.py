@@ -1 +1,59 @@
-FPS = 60
+import os
+from typing import Optional
+
+# Rate frames are rendered at.
+FPS = int(os.environ.get("GGJ_FPS", "60"))
+
+# Rate the simulation is stepped at, independently of rendering. Physics
+# constants are tuned for 60Hz and scaled to the length of the steps.
+PHYSICS_HZ = int(os.environ.get("GGJ_PHYSICS_HZ", "60"))
+
+# Most physics steps run for a single rendered frame. When frames take longer
+# than this many steps the simulation slows down instead of spending even more
+# time catching up.
+MAX_PHYSICS_STEPS_PER_FRAME = 5
+
+# How frames are drawn, "software" blits to the window surface, "gpu" draws
+# textures with an SDL renderer. Falls back to software if the GPU can't be used.
+RENDER_BACKEND = os.environ.get("GGJ_RENDER_BACKEND", "software")
+
+# Quality level to draw at, one of quality.QUALITY_LEVELS, or "auto" to pick
+# one based on how long frames take.
+QUALITY = os.environ.get("GGJ_QUALITY", "auto")
+
+# Time each stage of every frame from the start, instead of only while the
+# timings overlay is shown. They're written out on exit.
+TIMINGS = os.environ.get("GGJ_TIMINGS", "0") == "1"
+
+# Frames profiled after pressing the profile key, and where the profiles go.
+PROFILE_FRAMES = int(os.environ.get("GGJ_PROFILE_FRAMES", "300"))
+PROFILE_DIR = os.environ.get("GGJ_PROFILE_DIR", "profiles")
+
+# Record every frame's input to this file, or replay a recording from this
+# file, instead of playing normally.
+RECORD = os.environ.get("GGJ_RECORD", "")
+REPLAY = os.environ.get("GGJ_REPLAY", "")
+
+# Only redraw the parts of the screen that changed while the camera is still,
+# instead of the whole screen every frame. Saves a lot of CPU on idle frames.
+DIRTY_RECTS = os.environ.get("GGJ_DIRTY_RECTS", "0") == "1"
+
+# Run mypy over the package before starting, for development.
+CHECK_TYPES = os.environ.get("GGJ_CHECK_TYPES", "0") == "1"
+
+# Level logged to ggj.log, and levels of particular modules on top of it like
+# "ggj.keys=INFO,ggj.terrain=WARNING".
+LOG_LEVEL = os.environ.get("GGJ_LOG_LEVEL", "DEBUG")
+LOG_LEVELS = os.environ.get("GGJ_LOG_LEVELS", "")
+
+
+def _parse_resolution(value: str) -> Optional[tuple[int, int]]:
+    if not value:
+        return None
+    width, height = value.lower().split("x")
+    return int(width), int(height)
+
+
+# Resolution frames are drawn at before being scaled to fit the window, like
+# "960x540". The camera's base resolution if not set.
+RENDER_RESOLUTION = _parse_resolution(os.environ.get("GGJ_RENDER_RESOLUTION", ""))
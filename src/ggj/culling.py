@@ -0,0 +1,88 @@
+import logging
+from typing import Protocol, cast
+
+import pygame as pg
+
+from ggj.camera import camera
+from ggj.canvas import Canvas, SurfaceCanvas
+from ggj.game_object import GameObject, Interpolated
+
+logger = logging.getLogger(__name__)
+
+# How far outside the view port (in world pixels) sprites are still drawn.
+# Sprite images can be a lot bigger than their world rects, the player is
+# drawn at 4x, so this needs to be generous.
+CULL_MARGIN = 200
+
+# How often (in frames) culling counters are logged.
+CULL_LOG_INTERVAL = 600
+
+
+class DrawnSprite(Protocol):
+    image: pg.Surface
+    rect: pg.Rect
+
+
+class CullStats:
+    """Counts of sprites drawn and culled, for the last frame and in total."""
+
+    def __init__(self) -> None:
+        self.frames = 0
+        self.drawn = 0
+        self.culled = 0
+        self.total_drawn = 0
+        self.total_culled = 0
+
+    def record(self, drawn: int, culled: int) -> None:
+        self.frames += 1
+        self.drawn = drawn
+        self.culled = culled
+        self.total_drawn += drawn
+        self.total_culled += culled
+
+        if self.frames % CULL_LOG_INTERVAL == 0:
+            logger.info(
+                f"culling over {self.frames} frames: "
+                f"{self.total_drawn / self.frames:.1f} drawn, "
+                f"{self.total_culled / self.frames:.1f} culled per frame"
+            )
+
+
+class CulledGroup(pg.sprite.Group):
+    """
+    Sprite group that only places and draws the sprites near the camera's
+    view port. Sprites must be GameObjects and Interpolated.
+    """
+
+    _visible: list[pg.sprite.Sprite]
+
+    def __init__(self, *sprites: pg.sprite.Sprite, margin: int = CULL_MARGIN):
+        super().__init__(*sprites)
+        self.margin = margin
+        self.stats = CullStats()
+        self._visible = []
+
+    def interpolate(self, alpha: float) -> None:
+        """
+        Work out which sprites are visible this frame and update their screen
+        rects, the rest are left untouched.
+        """
+        bounds = camera.get_view_port().inflate(self.margin * 2, self.margin * 2)
+        self._visible = [
+            s
+            for s in self.sprites()
+            if cast(GameObject, s).world_rect.colliderect(bounds)
+        ]
+        for sprite in self._visible:
+            cast(Interpolated, sprite).interpolate(alpha)
+
+        self.stats.record(len(self._visible), len(self) - len(self._visible))
+
+    def draw_visible(self, canvas: Canvas) -> None:
+        """Draw the sprites found visible by the last interpolate."""
+        drawn = cast(list[DrawnSprite], self._visible)
+        canvas.blits([(s.image, s.rect) for s in drawn])
+
+    def draw(self, surface: pg.Surface, *args, **kwargs) -> list[pg.Rect]:
+        self.draw_visible(SurfaceCanvas(surface))
+        return []
@@ -1,62 +1,174 @@
 from __future__ import annotations
-from typing import Protocol
+from typing import Optional, Protocol
+import numpy as np
 import pygame as pg
 from pygame.math import Vector2
 import logging
 
+from ggj.canvas import Canvas
+
 GRAVITY = pg.Vector2(0, 10)
 
+# Rate the physics constants are tuned for. Forces and velocities are per step
+# at this rate, and scaled to the length of the steps actually taken.
+TUNED_PHYSICS_HZ = 60
+
 logger = logging.getLogger(__name__)
 
 
+class PhysicsWorld:
+    """
+    Every dynamic point mass, stored as contiguous arrays so the whole world
+    is integrated in one vectorised step. Static things (walls, poles) have no
+    business being in here.
+    """
+
+    positions: np.ndarray
+    # positions at the end of the previous physics step, for interpolation
+    previous_positions: np.ndarray
+    velocities: np.ndarray
+    forces: np.ndarray
+    inverse_masses: np.ndarray
+    rigid_multipliers: np.ndarray
+
+    _ARRAYS = (
+        "positions",
+        "previous_positions",
+        "velocities",
+        "forces",
+        "inverse_masses",
+        "rigid_multipliers",
+    )
+
+    def __init__(self, capacity: int = 16):
+        self._count = 0
+        self.positions = np.zeros((capacity, 2))
+        self.previous_positions = np.zeros((capacity, 2))
+        self.velocities = np.zeros((capacity, 2))
+        self.forces = np.zeros((capacity, 2))
+        self.inverse_masses = np.zeros(capacity)
+        self.rigid_multipliers = np.ones((capacity, 2))
+
+    def _grow(self) -> None:
+        """Double the capacity of every array."""
+        for name in self._ARRAYS:
+            old = getattr(self, name)
+            setattr(self, name, np.concatenate([old, np.zeros_like(old)]))
+
+    def __len__(self) -> int:
+        return self._count
+
+    def add(self, position: pg.Vector2, mass: float) -> int:
+        """Add a body to the world and return its index."""
+        if self._count == len(self.positions):
+            self._grow()
+
+        i = self._count
+        self._count += 1
+        self.positions[i] = self.previous_positions[i] = position
+        self.velocities[i] = self.forces[i] = 0
+        self.inverse_masses[i] = 1 / mass
+        self.rigid_multipliers[i] = 1
+        return i
+
+    def clear(self) -> None:
+        """Remove every body. Handles to them must not be used again."""
+        self._count = 0
+
+    def step(self, seconds: float) -> None:
+        """
+        Integrate every body over one physics step.
+
+        Args:
+            seconds: Length of the step, forces and velocities are scaled from
+                TUNED_PHYSICS_HZ steps to it.
+        """
+        n = self._count
+        scale = seconds * TUNED_PHYSICS_HZ
+        forces = self.forces[:n]
+        forces *= self.rigid_multipliers[:n]
+        self.velocities[:n] += forces * self.inverse_masses[:n, np.newaxis] * scale
+
+        self.previous_positions[:n] = self.positions[:n]
+        self.positions[:n] += self.velocities[:n] * scale
+        forces.fill(0)
+
+
+physics_world = PhysicsWorld()
+
+
 class PointMass:
     """
-    Represents a point mass that we can apply physics to
+    Represents a point mass that we can apply physics to. This is a handle to
+    a body in a PhysicsWorld, vectors read from it are copies.
     """
 
-    position: pg.Vector2
-    _velocity: pg.Vector2
-    _accumulative_force: pg.Vector2
-    _mass: float
-    _rigid_multiplier: pg.Vector2
+    _world: PhysicsWorld
+    _index: int
 
-    def __init__(self, position: pg.Vector2, mass: float):
-        self.position = position
-        self._mass = mass
-        self._accumulative_force = pg.Vector2(0, 0)
-        self._velocity = pg.Vector2(0, 0)
-        self._rigid_multiplier = pg.Vector2(1, 1)
+    def __init__(
+        self, position: pg.Vector2, mass: float, world: Optional[PhysicsWorld] = None
+    ):
+        self._world = world if world is not None else physics_world
+        self._index = self._world.add(position, mass)
 
     def add_force(self, force: pg.Vector2):
-        self._accumulative_force += force
+        self._world.forces[self._index] += force
+
+    def add_impulse(self, impulse: pg.Vector2, step_seconds: float):
+        """
+        Add a force that only acts for the next step, scaled so it changes the
+        velocity by the same amount however long the step is.
+        """
+        self._world.forces[self._index] += impulse / (step_seconds * TUNED_PHYSICS_HZ)
 
     def apply_gravity(self):
-        self._accumulative_force += GRAVITY
+        self._world.forces[self._index] += GRAVITY
 
     def get_force(self) -> pg.Vector2:
-        return self._accumulative_force
+        return pg.Vector2(*self._world.forces[self._index])
 
-    def integrate(self):
-        # logger.debug(f"applying force {self._accumulative_force}")
-        self._accumulative_force = (
-            self._accumulative_force.elementwise() * self._rigid_multiplier
-        )
-        acceleration = self._accumulative_force / self._mass
-        self._velocity += acceleration
-
-        self.position += self._velocity
-        self._accumulative_force = pg.Vector2(0, 0)
+    @property
+    def position(self) -> pg.Vector2:
+        return pg.Vector2(*self._world.positions[self._index])
+
+    @position.setter
+    def position(self, position: pg.Vector2) -> None:
+        self._world.positions[self._index] = position
+
+    def set_position(
+        self, x: Optional[float] = None, y: Optional[float] = None
+    ) -> None:
+        """Set one or both components of the position."""
+        if x is not None:
+            self._world.positions[self._index, 0] = x
+        if y is not None:
+            self._world.positions[self._index, 1] = y
+
+    def interpolated_position(self, alpha: float) -> pg.Vector2:
+        """Position between the previous and current physics step."""
+        previous = pg.Vector2(*self._world.previous_positions[self._index])
+        return previous.lerp(self.position, alpha)
 
     def reset_velocty(self):
-        self._velocity = pg.Vector2()
+        self._world.velocities[self._index] = 0
 
     @property
     def velocity(self) -> Vector2:
-        return self._velocity
+        return pg.Vector2(*self._world.velocities[self._index])
+
+    def set_velocity(
+        self, x: Optional[float] = None, y: Optional[float] = None
+    ) -> None:
+        """Set one or both components of the velocity."""
+        if x is not None:
+            self._world.velocities[self._index, 0] = x
+        if y is not None:
+            self._world.velocities[self._index, 1] = y
 
     def make_rigid_y(self, rigid_y=True):
-        self._rigid_multiplier.y = 0 if rigid_y else 1
-        self._velocity.y = 0
+        self._world.rigid_multipliers[self._index, 1] = 0 if rigid_y else 1
+        self._world.velocities[self._index, 1] = 0
 
 
 class GameObject(Protocol):
@@ -69,6 +181,15 @@ class PhysicsBody(Protocol):
     def point_mass(self) -> PointMass: ...
 
 
+class Interpolated(Protocol):
+    """
+    Something drawn between physics steps, which places itself on screen
+    somewhere between its previous and current state.
+    """
+
+    def interpolate(self, alpha: float) -> None: ...
+
+
 class Drawable(Protocol):
     """
     Represents something in the world
@@ -77,4 +198,4 @@ class Drawable(Protocol):
     image.
     """
 
-    def draw(self, screen: pg.Surface) -> None: ...
+    def draw(self, canvas: Canvas) -> None: ...
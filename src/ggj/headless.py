@@ -0,0 +1,151 @@
+import argparse
+import logging
+import os
+import time
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+import pygame as pg
+
+from ggj import camera as cam
+from ggj.canvas import SOFTWARE_BACKEND, WindowCanvas, make_canvas
+from ggj.camera import camera
+from ggj.constants import LOG_LEVEL, LOG_LEVELS, PHYSICS_HZ
+from ggj.keys import key_manager
+from ggj.log import setup_logging
+from ggj.main import Game
+from ggj.render import FullRenderer, Renderer
+from ggj.replay import Recording
+from ggj.timings import frame_timer
+
+logger = logging.getLogger(__name__)
+
+
+class RunResult(NamedTuple):
+    frames: int
+    seconds: float
+    # first frame a replay didn't match its recording on
+    diverged_at: Optional[int]
+
+
+def start_pygame(
+    resolution: tuple[int, int] = cam.BASE_RESOLUTION,
+) -> WindowCanvas:
+    """
+    Start pygame without a window or sound, returns what to draw on.
+
+    Args:
+        resolution: Resolution to draw at. Replays have to use the one they
+            were recorded at, as mouse positions are on a screen that size.
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    pg.init()
+
+    # images are converted to the display format, so there has to be one
+    canvas = make_canvas(SOFTWARE_BACKEND, resolution, "Stickney Lineman")
+    camera.resize(canvas.get_size())
+    return canvas
+
+
+def setup(
+    seed: Optional[int] = None,
+    resolution: tuple[int, int] = cam.BASE_RESOLUTION,
+) -> tuple[Game, WindowCanvas]:
+    """
+    Start pygame without a window or sound and make a game, as if the start
+    menu had been dismissed.
+
+    Args:
+        seed: Passed on to the game.
+        resolution: Passed on to start_pygame.
+    """
+    canvas = start_pygame(resolution)
+    return Game(canvas, seed), canvas
+
+
+def run(
+    game: Game,
+    frames: int,
+    renderer: Optional[Renderer] = None,
+    replay: Optional[Recording] = None,
+) -> RunResult:
+    """
+    Run frames of the game loop as fast as possible.
+
+    Args:
+        game: Game to run.
+        frames: How many frames to run, at one physics step a frame.
+        renderer: Draws each frame if given, otherwise nothing is drawn.
+        replay: Input and frame times to run with instead, for as many
+            frames as were recorded. The game has to use its seed and
+            resolution.
+    """
+    if replay is not None:
+        frames = len(replay)
+    diverged_at = None
+
+    start = time.perf_counter()
+    for i in range(frames):
+        frame_timer.start_frame()
+        key_manager.update()
+        frame_seconds = 1.0 / PHYSICS_HZ
+        if replay is not None:
+            key_manager.restore(replay.frames[i].input)
+            frame_seconds = replay.frames[i].frame_seconds
+        frame_timer.lap("input")
+
+        alpha = game.advance(frame_seconds)
+
+        if replay is not None and diverged_at is None:
+            position = game.player.point_mass.position
+            if (position.x, position.y) != replay.frames[i].player_position:
+                diverged_at = i
+        if renderer is not None:
+            renderer.draw_game(game, alpha)
+        frame_timer.end_frame()
+
+    return RunResult(frames, time.perf_counter() - start, diverged_at)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Run the game without a window, as fast as it goes."
+    )
+    parser.add_argument("--frames", type=int, default=3600)
+    parser.add_argument(
+        "--render", action="store_true", help="draw every frame offscreen too"
+    )
+    parser.add_argument(
+        "--replay", type=Path, help="run a recording made with GGJ_RECORD"
+    )
+    args = parser.parse_args()
+    setup_logging(Path("ggj.log"), LOG_LEVEL, LOG_LEVELS)
+
+    replay = Recording.load(args.replay) if args.replay else None
+    game, canvas = setup(replay.seed, replay.resolution) if replay else setup()
+    frame_timer.enabled = True
+    renderer = FullRenderer(canvas) if args.render else None
+
+    result = run(game, args.frames, renderer, replay)
+
+    print(
+        f"{result.frames} frames in {result.seconds:.2f}s, "
+        f"{result.frames / result.seconds:.0f} fps"
+    )
+    if replay is not None:
+        if result.diverged_at is None:
+            print("replay matched the recording")
+        else:
+            print(f"replay diverged from the recording at frame {result.diverged_at}")
+    for stage, stats in frame_timer.stats().items():
+        if stats["p99"] > 0:
+            percentiles = ", ".join(f"{p} {ms:.3f}ms" for p, ms in stats.items())
+            print(f"  {stage:<12} {percentiles}")
+
+    game.shutdown()
+    pg.quit()
+
+
+if __name__ == "__main__":
+    main()
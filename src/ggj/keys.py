@@ -1,67 +1,132 @@
 import logging
 import pygame as pg
-from typing import Optional
+from typing import Callable, NamedTuple, Optional
+
+from ggj.log import RateLimitedLogger
 
 logger = logging.getLogger(__name__)
+# mouse motion comes in dozens of events a frame
+motion_logger = RateLimitedLogger(logger)
+
+
+class InputState(NamedTuple):
+    """Everything KeyManager knows about the input after an update."""
+
+    key_down: frozenset[int]
+    key_pressed: frozenset[int]
+    is_quit: bool
+    mouse_left_down_pos: Optional[tuple[int, int]]
+    mouse_right_down_pos: Optional[tuple[int, int]]
+    mouse_right_up_pos: Optional[tuple[int, int]]
 
 
 class KeyManager:
     # Holds keys that are currently in the down state
     key_down: set[int]
+    # Keys that went down since the last update
+    key_pressed: set[int]
     is_quit: bool
     _mouse_left_down_pos: Optional[tuple[int, int]]
     _mouse_right_down_pos: Optional[tuple[int, int]]
     _mouse_right_up_pos: Optional[tuple[int, int]]
+    _resized_to: Optional[tuple[int, int]]
+    # maps window coordinates onto the screen the game is drawn on
+    _window_to_screen: Callable[[tuple[int, int]], tuple[int, int]]
 
     def __init__(self) -> None:
         self.key_down = set()
+        self.key_pressed = set()
         self.is_quit = False
         self._mouse_left_down_pos = None
         self._mouse_right_down_pos = None
         self._mouse_right_up_pos = None
+        self._resized_to = None
+        self._window_to_screen = lambda pos: pos
+
+    def set_window_to_screen(
+        self, window_to_screen: Callable[[tuple[int, int]], tuple[int, int]]
+    ) -> None:
+        """Set how mouse positions in the window map onto the game's screen."""
+        self._window_to_screen = window_to_screen
+
+    def mouse_pos(self) -> tuple[int, int]:
+        return self._window_to_screen(pg.mouse.get_pos())
 
     def update(self) -> None:
+        # _mouse_right_up_pos is left alone, it is held until popped as
+        # physics steps don't line up with frames
         self.is_quit = False
-        self._mouse_right_up_pos = None
+        self.key_pressed.clear()
 
         for event in pg.event.get():
             # nothing to do if key event has not been fired
-            if event.type == pg.QUIT:
+            if event.type in (pg.QUIT, pg.WINDOWCLOSE):
                 self.is_quit = True
+            elif event.type == pg.WINDOWSIZECHANGED:
+                # sent for renderer windows too, unlike VIDEORESIZE
+                logger.debug("window resized to %dx%d", event.x, event.y)
+                self._resized_to = (event.x, event.y)
             elif event.type == pg.KEYDOWN:
-                logger.debug(f"adding key {event.key} to 'down' set")
+                logger.debug("adding key %s to 'down' set", event.key)
                 self.key_down.add(event.key)
+                self.key_pressed.add(event.key)
             elif event.type == pg.KEYUP:
-                logger.debug(f"removing key {event.key} from 'down' set")
+                logger.debug("removing key %s from 'down' set", event.key)
                 self.key_down.discard(event.key)
             elif event.type == pg.MOUSEBUTTONDOWN:
-                logger.debug(f"mouse down at pos {pg.mouse.get_pos()}")
+                pos = self.mouse_pos()
+                logger.debug("mouse down at pos %s", pos)
                 left, _, right = pg.mouse.get_pressed()
                 if left:
-                    self._mouse_left_down_pos = pg.mouse.get_pos()
+                    self._mouse_left_down_pos = pos
                 if right:
-                    self._mouse_right_down_pos = pg.mouse.get_pos()
+                    self._mouse_right_down_pos = pos
             elif event.type == pg.MOUSEMOTION and (
                 self._mouse_left_down_pos is not None
                 or self._mouse_right_down_pos is not None
             ):
-                logger.debug(f"mouse move with down at pos {pg.mouse.get_pos()}")
+                pos = self.mouse_pos()
+                motion_logger.debug("mouse move with down at pos %s", pos)
                 left, _, right = pg.mouse.get_pressed()
                 if left:
-                    self._mouse_left_down_pos = pg.mouse.get_pos()
+                    self._mouse_left_down_pos = pos
                 if right:
-                    self._mouse_right_down_pos = pg.mouse.get_pos()
+                    self._mouse_right_down_pos = pos
             elif event.type == pg.MOUSEBUTTONUP:
-                logger.debug(f"mouse up at pos {pg.mouse.get_pos()}")
+                pos = self.mouse_pos()
+                logger.debug("mouse up at pos %s", pos)
                 self._mouse_left_down_pos = None
                 self._mouse_right_down_pos = None
                 if event.button == 3:
-                    self._mouse_right_up_pos = pg.mouse.get_pos()
+                    self._mouse_right_up_pos = pos
+
+    def snapshot(self) -> InputState:
+        return InputState(
+            frozenset(self.key_down),
+            frozenset(self.key_pressed),
+            self.is_quit,
+            self._mouse_left_down_pos,
+            self._mouse_right_down_pos,
+            self._mouse_right_up_pos,
+        )
+
+    def restore(self, state: InputState) -> None:
+        """Put the input back to a snapshot, instead of reading events."""
+        self.key_down = set(state.key_down)
+        self.key_pressed = set(state.key_pressed)
+        self.is_quit = state.is_quit
+        self._mouse_left_down_pos = state.mouse_left_down_pos
+        self._mouse_right_down_pos = state.mouse_right_down_pos
+        self._mouse_right_up_pos = state.mouse_right_up_pos
 
     def is_key_down(self, key: int) -> bool:
         """Checks if the key is in the set of keys that are down"""
         return key in self.key_down
 
+    def was_key_pressed(self, key: int) -> bool:
+        """Checks if the key went down since the last update, for toggles."""
+        return key in self.key_pressed
+
     def quit(self) -> bool:
         return self.is_quit
 
@@ -74,6 +139,16 @@ class KeyManager:
     def get_right_up_pos(self) -> Optional[tuple[int, int]]:
         return self._mouse_right_up_pos
 
+    def pop_resize(self) -> Optional[tuple[int, int]]:
+        """Get the new window size if it has changed since the last call."""
+        size, self._resized_to = self._resized_to, None
+        return size
+
+    def pop_right_up_pos(self) -> Optional[tuple[int, int]]:
+        """Get the last right click release and clear it, so it's handled once."""
+        pos, self._mouse_right_up_pos = self._mouse_right_up_pos, None
+        return pos
+
 
 key_manager = KeyManager()
 
@@ -85,6 +160,8 @@ class KeyMaps:
     _player_down: int
     _player_jump: int
     _start_game: int
+    _toggle_timings: int
+    _toggle_profile: int
 
     def __init__(self):
         self._player_left = pg.K_a
@@ -93,6 +170,8 @@ class KeyMaps:
         self._player_down = pg.K_s
         self._player_jump = pg.K_SPACE
         self._start_game = pg.K_SPACE
+        self._toggle_timings = pg.K_F3
+        self._toggle_profile = pg.K_F4
 
     @property
     def player_left(self):
@@ -118,5 +197,13 @@ class KeyMaps:
     def start_game(self):
         return self._start_game
 
+    @property
+    def toggle_timings(self):
+        return self._toggle_timings
+
+    @property
+    def toggle_profile(self):
+        return self._toggle_profile
+
 
 key_map = KeyMaps()
@@ -0,0 +1,62 @@
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable
+
+from ggj.assets import GRAPPLE_PATH, WALKING_PATH, load_sound
+from ggj.background import load_mars_image, load_star_image
+from ggj.player import load_sprite_sheet
+from ggj.world import load_surface_block_images
+
+logger = logging.getLogger(__name__)
+
+# Worker threads loading assets. Most of the work is decoding and scaling in
+# C, which doesn't hold the GIL the whole time.
+LOADER_WORKERS = 4
+
+# Images and sounds a Game loads, all cached so loading them again is free.
+# The map is loaded as a task of its own.
+GAME_ASSETS: tuple[Callable[[], Any], ...] = (
+    load_surface_block_images,
+    load_sprite_sheet,
+    load_star_image,
+    load_mars_image,
+    partial(load_sound, GRAPPLE_PATH),
+    partial(load_sound, WALKING_PATH),
+)
+
+
+class AssetLoader:
+    """
+    Runs loading tasks on a pool of worker threads, so the game can show
+    something while they run. A display mode has to be set before images are
+    loaded, as they're converted to its format.
+    """
+
+    _futures: list[Future]
+
+    def __init__(self, workers: int = LOADER_WORKERS):
+        self._executor = ThreadPoolExecutor(workers, thread_name_prefix="loader")
+        self._futures = []
+
+    def submit(self, task: Callable[[], Any]) -> Future:
+        """Queue a task, tasks start in the order they're submitted."""
+        future = self._executor.submit(task)
+        self._futures.append(future)
+        return future
+
+    def progress(self) -> tuple[int, int]:
+        """Tasks finished, and tasks submitted."""
+        return sum(f.done() for f in self._futures), len(self._futures)
+
+    @property
+    def ready(self) -> bool:
+        return all(f.done() for f in self._futures)
+
+    def wait(self) -> None:
+        """Wait for every task, raising the first error any of them had."""
+        for future in self._futures:
+            future.result()
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,102 @@
+import atexit
+import logging
+import queue
+import time
+from logging.handlers import QueueHandler, QueueListener
+from pathlib import Path
+from typing import Any, Callable
+
+# Seconds between messages from the same rate limited log call.
+HOT_PATH_LOG_INTERVAL = 1.0
+
+LOG_FORMAT = "%(asctime)s,%(msecs)03d %(name)s %(levelname)s %(message)s"
+LOG_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def parse_levels(value: str) -> dict[str, int]:
+    """
+    Parse per logger levels, like "ggj.keys=INFO,ggj.terrain=WARNING".
+
+    Raises:
+        ValueError: If an entry isn't a name and level, or the level isn't one
+            logging knows.
+    """
+    levels = {}
+    for entry in filter(None, (e.strip() for e in value.split(","))):
+        name, _, level = entry.partition("=")
+        if not name.strip() or not level.strip() or "=" in level:
+            raise ValueError(f"log level {entry!r} isn't like logger=LEVEL")
+        if not isinstance(number := logging.getLevelName(level.strip().upper()), int):
+            raise ValueError(f"unknown log level {level!r} for {name}")
+        levels[name.strip()] = number
+    return levels
+
+
+def setup_logging(path: Path, level: str, module_levels: str = "") -> QueueListener:
+    """
+    Log to a file from a background thread, so logging never waits on disk.
+    Records are put on a queue by whichever thread logs them, and a listener
+    thread writes them out. The listener is stopped, flushing the queue, at
+    exit.
+
+    Args:
+        path: File to log to, replaced each run.
+        level: Level of the root logger, like "DEBUG".
+        module_levels: Levels of particular loggers, see parse_levels.
+
+    Returns:
+        The listener, already started.
+    """
+    file_handler = logging.FileHandler(path, mode="w")
+    file_handler.setFormatter(logging.Formatter(LOG_FORMAT, LOG_DATE_FORMAT))
+
+    records: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    listener = QueueListener(records, file_handler)
+    listener.start()
+    atexit.register(listener.stop)
+
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(QueueHandler(records))
+    root.setLevel(level.upper())
+    for name, module_level in parse_levels(module_levels).items():
+        logging.getLogger(name).setLevel(module_level)
+
+    return listener
+
+
+class RateLimitedLogger:
+    """
+    Wraps a logger for calls made every frame or step. Each call site, told
+    apart by its format string, logs at most once an interval, and says how
+    many of its messages were dropped since. Arguments are only formatted
+    for messages that are logged.
+    """
+
+    def __init__(
+        self,
+        logger: logging.Logger,
+        interval: float = HOT_PATH_LOG_INTERVAL,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.logger = logger
+        self.interval = interval
+        self.clock = clock
+        self._last: dict[str, float] = {}
+        self._dropped: dict[str, int] = {}
+
+    def debug(self, msg: str, *args: Any) -> None:
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
+
+        now = self.clock()
+        if (last := self._last.get(msg)) is not None and now - last < self.interval:
+            self._dropped[msg] = self._dropped.get(msg, 0) + 1
+            return
+        self._last[msg] = now
+
+        if dropped := self._dropped.pop(msg, 0):
+            self.logger.debug(msg + " (%d more dropped)", *args, dropped, stacklevel=2)
+        else:
+            self.logger.debug(msg, *args, stacklevel=2)
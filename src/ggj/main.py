@@ -1,130 +1,432 @@
 import logging
-import subprocess
+import random
+from typing import Optional
+from pathlib import Path
 
+import numpy as np
 import pygame as pg
 
 from ggj import camera as cam
 from ggj.assets import THEME_PATH, START_MENU_PATH
-from ggj.background import apply_star_tiles, apply_mars
-from ggj.constants import FPS
-from ggj.map.importer import surface_blocks
+from ggj.audio import audio_manager
+from ggj.background import (
+    apply_mars,
+    apply_star_tiles,
+    load_mars_image,
+    load_star_image,
+)
+from ggj.canvas import Canvas, make_canvas
+from ggj.constants import (
+    CHECK_TYPES,
+    DIRTY_RECTS,
+    RENDER_BACKEND,
+    RENDER_RESOLUTION,
+    FPS,
+    LOG_LEVEL,
+    LOG_LEVELS,
+    MAX_PHYSICS_STEPS_PER_FRAME,
+    PHYSICS_HZ,
+    PROFILE_DIR,
+    PROFILE_FRAMES,
+    QUALITY,
+    RECORD,
+    REPLAY,
+    TIMINGS,
+)
+from ggj.map.importer import compiled_world, map_items, surface_blocks
 from ggj.telegraph import telegraph_placer
-from ggj.ui import UserInterface
+from ggj.ui import UI_PADDING_PX, UserInterface
+from ggj.ui.loading_bar import LoadingBar
 from ggj.keys import key_manager, key_map
+from ggj.loading import GAME_ASSETS, AssetLoader
+from ggj.log import setup_logging
 from ggj.player import GrapplingHook, Player
-from ggj.camera import BASE_RESOLUTION, camera
-from ggj.game_object import PhysicsBody
-from ggj import collision
-from ggj.world import SurfaceBlock, map_to_world_coords
-
-logging.basicConfig(
-    filename="ggj.log",
-    filemode="w",
-    format="%(asctime)s,%(msecs)03d %(name)s %(levelname)s %(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S",
-    level=logging.DEBUG,
-)
+from ggj.camera import camera
+from ggj.game_object import physics_world
+from ggj.collision import collision_object_manager
+from ggj.culling import CulledGroup
+from ggj.profiling import ProfileCapture
+from ggj.quality import quality_governor
+from ggj.render import make_renderer
+from ggj.replay import Recording
+from ggj.startup import startup_timer
+from ggj.timings import frame_timer
+from ggj.tilemap import TileMap
+from ggj.terrain import ChunkStreamer, TerrainLayout, TerrainRenderer
+from ggj.world import map_to_world_coords
+
 logger = logging.getLogger(__name__)
 
 
 def check_types() -> None:
+    import subprocess
+
     subprocess.run(["mypy", "-p", "ggj"], check=True)
 
 
-def main():
-    check_types()
-    pg.init()
-    clock = pg.time.Clock()
-    screen = pg.display.set_mode(cam.BASE_RESOLUTION, pg.RESIZABLE)
-    pg.display.set_caption("Stickney Lineman")
+class Game:
+    """Everything in the world, stepped at a fixed rate and drawn every frame."""
 
-    done = False
-    main_menu = True
+    def __init__(
+        self,
+        canvas: Canvas,
+        seed: Optional[int] = None,
+        compiled_map: Optional[dict[str, np.ndarray]] = None,
+    ):
+        """
+        Args:
+            canvas: What the game will be drawn on.
+            seed: Seed for anything random, so runs can be repeated.
+            compiled_map: Map to play on, as made by compile_map. Defaults to
+                world.png.
+        """
+        # bodies and poles live in module level singletons, a new game clears
+        # out the last one's
+        physics_world.clear()
+        telegraph_placer.reset()
+
+        if compiled_map is None:
+            compiled = compiled_world()
+            location_markers = surface_blocks().location_markers
+        else:
+            compiled = compiled_map
+            location_markers = map_items(compiled_map).location_markers
+
+        # surface blocks are streamed in chunks around the camera
+
+        terrain_layout = TerrainLayout(
+            compiled["surface_blocks"], np.random.default_rng(seed)
+        )
+        self.terrain = ChunkStreamer(terrain_layout)
+        self.terrain_renderer = TerrainRenderer(terrain_layout)
+        collision_object_manager.register_tilemap(
+            TileMap.from_world_array(compiled["world"])
+        )
+
+        # user interface
+
+        self.user_interface = UserInterface(canvas, location_markers)
+        self.object_group = CulledGroup()
+
+        # player stuff
+
+        player_init_pos = map_to_world_coords(pg.Vector2(750, 60))
+        self.player = Player(player_init_pos)
+        self.object_group.add(self.player)
+        camera.follow(self.player)
+        self.object_group.add(*telegraph_placer.poles)
+
+        self.grapling_hook = GrapplingHook(self.player)
+
+        # the simulation runs in fixed steps, time left over from previous
+        # frames is carried in the accumulator
+        self._accumulator = 0.0
+
+    def advance(self, frame_seconds: float) -> float:
+        """
+        Step the simulation as many times as fit in the time since the last
+        frame.
+
+        Returns:
+            How far between the last two steps to draw things, from 0 to 1.
+        """
+        step_seconds = 1.0 / PHYSICS_HZ
+        self._accumulator += frame_seconds
+        steps = 0
+        while self._accumulator >= step_seconds:
+            if steps == MAX_PHYSICS_STEPS_PER_FRAME:
+                # drop the time we can't catch up on
+                logger.debug("dropping %.3fs of simulation", self._accumulator)
+                self._accumulator = 0.0
+                break
+            self.step()
+            self._accumulator -= step_seconds
+            steps += 1
+        return self._accumulator / step_seconds
+
+    def step(self) -> None:
+        """Advance the simulation by one physics step."""
+        self.terrain.update(camera.get_view_port())
+        self.player.update()
+        frame_timer.lap("simulation")
+        physics_world.step(1.0 / PHYSICS_HZ)
+        frame_timer.lap("physics")
+        camera.update()
+        self.user_interface.update(self.player.point_mass.position)
+        frame_timer.lap("simulation")
+
+    def draw(self, canvas: Canvas, alpha: float) -> None:
+        """
+        Draw the world.
+
+        Args:
+            canvas: What to draw on.
+            alpha: How far between the previous and current physics step to
+                draw things, from 0 to 1.
+        """
+        self.interpolate(alpha)
+        self.draw_background(canvas)
+        self.draw_objects(canvas)
+        self.draw_foreground(canvas)
+        self.draw_overlay(canvas)
+
+    def interpolate(self, alpha: float) -> None:
+        """Place the camera and everything on screen for this frame."""
+        camera.interpolate(alpha)
+        self.object_group.interpolate(alpha)
+        frame_timer.lap("interpolate")
+
+    def draw_background(self, canvas: Canvas) -> None:
+        quality = quality_governor.level
+        apply_star_tiles(canvas, camera, self.player, quality.star_stride)
+        if quality.draw_mars:
+            apply_mars(canvas, camera, self.player)
+        frame_timer.lap("background")
+
+    def draw_objects(self, canvas: Canvas) -> None:
+        self.object_group.draw_visible(canvas)
+        frame_timer.lap("objects")
 
-    # theme
+    def draw_foreground(self, canvas: Canvas) -> None:
+        self.terrain_renderer.draw(canvas)
+        canvas.draw_rect(
+            (0, 0, 255),
+            camera.get_screen_rect(
+                pg.Rect(80, 80, 200, 200),
+                zindex=2,
+            ),
+        )
+        frame_timer.lap("terrain")
 
-    music = pg.mixer.Sound(THEME_PATH)
-    music.play(loops=-1)
+    def draw_overlay(self, canvas: Canvas) -> None:
+        self.grapling_hook.draw(canvas)
+        frame_timer.lap("grapple")
+        self.user_interface.draw_on(canvas)
+        frame_timer.lap("ui")
 
-    # only render the 1/4 of the surface blocks
+    def describe_location(self) -> str:
+        position = self.player.point_mass.position
+        location = self.user_interface.nearest_location(position)
+        return f"player at ({position.x:.0f}, {position.y:.0f}) near {location}"
 
-    surface_block_vectors = surface_blocks().surface_blocks
-    surface_block_vectors.sort(key=lambda b: (b.x, b.y))
-    surface_block_vectors = surface_block_vectors[: len(surface_block_vectors)]
+    def images(self) -> list[pg.Surface]:
+        """Images drawn most frames, worth getting ready ahead of time."""
+        return [*self.player.sprites, load_star_image(), load_mars_image()]
 
-    blocks: pg.sprite.Group = pg.sprite.Group()
-    for v in surface_block_vectors:
-        blocks.add(SurfaceBlock(v))
+    def moving_rects(self) -> list[pg.Rect]:
+        """
+        Screen areas that can change from frame to frame while the camera
+        stays still. Only valid after interpolate.
+        """
+        player = self.player
+        rects = [pg.Rect(player.rect.topleft, player.image.get_size())]
+        if (line := self.grapling_hook.screen_rect()) is not None:
+            rects.append(line)
+        return rects
 
-    collision.collision_object_manager.register(SurfaceBlock, blocks)
+    def shutdown(self) -> None:
+        self.user_interface.shutdown()
 
-    # user interface
+
+def main():
+    setup_logging(Path("ggj.log"), LOG_LEVEL, LOG_LEVELS)
+    startup_timer.mark("imports")
+    if CHECK_TYPES:
+        check_types()
+        startup_timer.mark("type check")
+    pg.init()
+    clock = pg.time.Clock()
+
+    # a replay uses the seed, input and resolution it was recorded with
+    replay = Recording.load(Path(REPLAY)) if REPLAY else None
+    canvas = make_canvas(
+        RENDER_BACKEND,
+        cam.BASE_RESOLUTION,
+        "Stickney Lineman",
+        resolution=(
+            replay.resolution if replay else RENDER_RESOLUTION or cam.BASE_RESOLUTION
+        ),
+    )
+    camera.resize(canvas.get_size())
+    key_manager.set_window_to_screen(canvas.window_to_canvas)
+    startup_timer.mark("display init")
+
+    quality_governor.configure(QUALITY)
+    canvas.smooth = quality_governor.level.smooth
+    frame_timer.enabled = TIMINGS
+
+    done = False
+    main_menu = True
+
+    # the start menu goes up straight away, with everything else loading
+    # behind it
 
     start_img = pg.image.load(START_MENU_PATH)
     scale = [
-        BASE_RESOLUTION[0] / start_img.get_width(),
-        BASE_RESOLUTION[1] / start_img.get_height(),
+        canvas.resolution[0] / start_img.get_width(),
+        canvas.resolution[1] / start_img.get_height(),
     ]
     start_img = pg.transform.scale_by(start_img, scale)
+    canvas.preload([start_img])
+
+    loading_bar = LoadingBar()
+    loading_bar.rect.midbottom = (
+        canvas.resolution[0] // 2,
+        canvas.resolution[1] - UI_PADDING_PX,
+    )
+
+    # the theme streams from disk, so it can start straight away
+    audio_manager.play_music(THEME_PATH)
+
+    loader = AssetLoader()
+    loader.submit(surface_blocks).add_done_callback(
+        lambda _: startup_timer.mark("map import")
+    )
+    for task in GAME_ASSETS:
+        loader.submit(task)
+    startup_reported = False
+
+    recording = (
+        Recording(random.getrandbits(63), canvas.resolution)
+        if RECORD and replay is None
+        else None
+    )
+    seed = replay.seed if replay else recording.seed if recording else None
+    game: Optional[Game] = None
 
-    user_interface = UserInterface(screen, surface_blocks().location_markers)
-    object_group: pg.sprite.Group = pg.sprite.Group()
+    def start_game() -> Game:
+        # everything it loads is ready, so this is quick
+        loader.wait()
+        game = Game(canvas, seed)
+        canvas.preload(game.images())
+        return game
 
-    # player stuff
+    def describe_location() -> str:
+        return game.describe_location() if game is not None else "in the menu"
 
-    player_init_pos = map_to_world_coords(pg.Vector2(750, 60))
-    player = Player(player_init_pos)
-    object_group.add(player)
-    camera.follow(player)
-    object_group.add(*telegraph_placer.poles)
+    renderer = make_renderer(canvas, DIRTY_RECTS)
+    profile_capture = ProfileCapture(PROFILE_FRAMES, Path(PROFILE_DIR))
 
-    physics_bodies: list[PhysicsBody] = [player]
+    frame_seconds = 0.0
+    if replay is not None:
+        main_menu = False
+        game = start_game()
+        replay_frames = iter(replay.frames)
+        replay_frame_index = -1
+        # only the first frame that doesn't match is worth reporting
+        replay_diverged = False
 
-    object_group.add(*blocks)
-    grapling_hook = GrapplingHook(player)
     logger.info("starting main loop")
 
     while not done:
+        frame_timer.start_frame()
         key_manager.update()
 
         if key_manager.quit():
             done = True
             continue
 
-        screen.fill((0, 0, 0))
+        if replay is not None and not main_menu:
+            if (frame := next(replay_frames, None)) is None:
+                logger.info("replay finished")
+                done = True
+                continue
+            replay_frame_index += 1
+            key_manager.restore(frame.input)
+            frame_seconds = frame.frame_seconds
+            expected_position = frame.player_position
+        elif recording is not None and not main_menu:
+            recorded_input = key_manager.snapshot()
+
+        if game is not None and key_manager.was_key_pressed(key_map.toggle_timings):
+            shown = game.user_interface.toggle_timings()
+            frame_timer.enabled = TIMINGS or shown
+            frame_timer.start_frame()
+            renderer.invalidate()
+
+        if key_manager.was_key_pressed(key_map.toggle_profile):
+            if profile_capture.active:
+                profile_capture.stop(describe_location())
+            else:
+                profile_capture.start()
+        frame_timer.lap("input")
+
+        if (size := key_manager.pop_resize()) is not None:
+            canvas.resize(size)
+            renderer.invalidate()
 
         if main_menu:
-            screen.blit(
-                start_img,
-                start_img.get_rect(),
-            )
+            if game is None and loader.ready:
+                startup_timer.mark("asset load")
+                game = start_game()
+                startup_timer.mark("game ready")
+            loading_bar.show(*loader.progress())
+            renderer.draw_menu(start_img, loading_bar)
+            startup_timer.mark("first frame")
+
+            if game is not None and not startup_reported:
+                report = startup_timer.report()
+                logger.info(report)
+                print(report)
+                startup_reported = True
 
-            if key_manager.is_key_down(key_map.start_game):
+            # can't start until the world is loaded
+            if game is not None and key_manager.is_key_down(key_map.start_game):
                 main_menu = False
+                # a right click let go of on the menu would place a pole
+                key_manager.pop_right_up_pos()
         else:
-            apply_star_tiles(screen, camera, player)
-            apply_mars(screen, camera, player)
-            object_group.update()
-            for body in physics_bodies:
-                body.point_mass.integrate()
-            object_group.draw(screen)
-            pg.draw.rect(
-                screen,
-                (0, 0, 255),
-                camera.get_screen_rect(
-                    pg.Rect(80, 80, 200, 200),
-                    zindex=2,
-                ),
-            )
-            camera.update()
-            grapling_hook.draw(screen)
-            user_interface.draw(screen)
-            user_interface.update(player.point_mass.position)
-
-        pg.display.flip()
-        clock.tick(FPS)
-
-    user_interface.shutdown()
+            assert game is not None
+            alpha = game.advance(frame_seconds)
+
+            position = game.player.point_mass.position
+            if recording is not None:
+                recording.append(
+                    frame_seconds, recorded_input, (position.x, position.y)
+                )
+            elif (
+                replay is not None
+                and not replay_diverged
+                and (position.x, position.y) != expected_position
+            ):
+                logger.warning(
+                    "replay diverged at frame %d, expected %s but was at %s",
+                    replay_frame_index,
+                    expected_position,
+                    (position.x, position.y),
+                )
+                replay_diverged = True
+
+            renderer.draw_game(game, alpha)
+
+        frame_seconds = clock.tick(FPS) / 1000.0
+        frame_timer.lap("tick")
+        if not main_menu:
+            frame_timer.end_frame()
+
+        if profile_capture.end_frame():
+            profile_capture.stop(describe_location())
+
+        if not main_menu and (
+            level := quality_governor.record(clock.get_rawtime() / 1000.0)
+        ):
+            canvas.smooth = level.smooth
+            renderer.invalidate()
+
+    if recording is not None:
+        recording.save(Path(RECORD))
+
+    if profile_capture.active:
+        profile_capture.stop(describe_location())
+
+    if len(frame_timer):
+        frame_timer.export(Path("ggj-timings.csv"), Path("ggj-timings.json"))
+
+    logger.info(f"audio stats: {audio_manager.stats()}")
+
+    loader.shutdown()
+    if game is not None:
+        game.shutdown()
     pg.quit()
 
 
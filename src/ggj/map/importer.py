@@ -1,19 +1,40 @@
+import hashlib
+import logging
+import os
+import zipfile
 from functools import lru_cache
 from pathlib import Path
 from typing import NamedTuple
 
 import numpy as np
-from PIL import Image
 
 import pygame as pg
 from pygame import Vector2
 
+from ggj.cache import cache_dir
+
+logger = logging.getLogger(__name__)
+
 WORLD_PNG_PATH = Path(__file__).parent / "world.png"
 
+# Bump whenever the layout of the compiled map changes so old artifacts are
+# ignored rather than misread.
+COMPILED_MAP_VERSION = 1
+
+LOCATIONS = {
+    0xA0: "Limtoc crater",
+    0xA1: "Stickney east",
+    0xA2: "Stickney west",
+    0xA3: "The monolith",
+    0xA4: "The base",
+}
+
 
 @lru_cache
 def world_rgb_array():
     """Load world RGB array."""
+    from PIL import Image
+
     im = Image.open(WORLD_PNG_PATH)
 
     assert im.format == "PNG"
@@ -22,19 +43,91 @@ def world_rgb_array():
     return np.asarray(im)
 
 
-@lru_cache
-def world_array():
-    """Load world array, just 2D array of uint8s."""
-    rgb_array = world_rgb_array()
-    r_array = np.zeros(list(rgb_array.shape)[:2], dtype=np.uint8)
+def compile_map(w_array: np.ndarray) -> dict[str, np.ndarray]:
+    """
+    Compile a world array into the arrays the game needs.
+
+    Coordinates are stored as (x, y) rows in map units, in the same row-major
+    order the map is laid out in.
+    """
+    high = w_array & 0xF0
+
+    surface = np.argwhere(high == 0)[:, ::-1]
+    # TODO fix hack, change 0xF0 for mock block
+    mock = np.argwhere(w_array == 0xF0)[:, ::-1]
+
+    marker_ys, marker_xs = np.nonzero(high == 0xA0)
+    markers = np.stack([w_array[marker_ys, marker_xs], marker_xs, marker_ys], axis=1)
+
+    return {
+        "world": np.ascontiguousarray(w_array, dtype=np.uint8),
+        "surface_blocks": np.ascontiguousarray(surface, dtype=np.int32),
+        "mock_surface_blocks": np.ascontiguousarray(mock, dtype=np.int32),
+        "location_markers": np.ascontiguousarray(markers, dtype=np.int32),
+    }
+
+
+def compiled_map_path(png_path: Path, cache_directory: Path) -> Path:
+    """Path of the compiled artifact for the current contents of png_path."""
+    digest = hashlib.sha256(png_path.read_bytes()).hexdigest()[:16]
+    return cache_directory / f"map-v{COMPILED_MAP_VERSION}-{digest}.npz"
+
+
+def _decode_world_png(png_path: Path) -> np.ndarray:
+    # PIL is only needed when the compiled map isn't cached, so it's only
+    # imported then
+    from PIL import Image
+
+    with Image.open(png_path) as im:
+        assert im.format == "PNG"
+        assert im.mode == "RGB"
+        return np.asarray(im)[:, :, 0]
 
-    i_max, j_max = r_array.shape
 
-    for i in range(i_max):
-        for j in range(j_max):
-            r_array[i][j] = rgb_array[i][j][0]
+def load_compiled_map(png_path: Path, cache_directory: Path) -> dict[str, np.ndarray]:
+    """
+    Load the compiled form of a map PNG, compiling and caching it on a miss.
 
-    return r_array
+    Args:
+        png_path: The map image, only the red channel is used.
+        cache_directory: Where compiled artifacts live. Artifacts are keyed on
+            the PNG's content hash so an edited map is recompiled.
+    """
+    artifact = compiled_map_path(png_path, cache_directory)
+
+    try:
+        with np.load(artifact) as data:
+            return {k: data[k] for k in data.files}
+    except FileNotFoundError:
+        logger.info(f"no compiled map at {artifact}, compiling {png_path}")
+    except (OSError, ValueError, zipfile.BadZipFile) as e:
+        logger.warning(f"ignoring unreadable compiled map {artifact}: {e}")
+
+    compiled = compile_map(_decode_world_png(png_path))
+
+    # write to a temporary file first so a crash never leaves half an artifact
+    tmp = artifact.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        cache_directory.mkdir(parents=True, exist_ok=True)
+        with open(tmp, "wb") as f:
+            np.savez(f, allow_pickle=False, **compiled)
+        os.replace(tmp, artifact)
+    except OSError as e:
+        logger.warning(f"could not write compiled map {artifact}: {e}")
+        tmp.unlink(missing_ok=True)
+
+    return compiled
+
+
+@lru_cache
+def compiled_world() -> dict[str, np.ndarray]:
+    return load_compiled_map(WORLD_PNG_PATH, cache_dir())
+
+
+@lru_cache
+def world_array():
+    """Load world array, just 2D array of uint8s."""
+    return compiled_world()["world"]
 
 
 class MapItems(NamedTuple):
@@ -43,34 +136,19 @@ class MapItems(NamedTuple):
     location_markers: dict[str, list[Vector2]]
 
 
+def map_items(compiled: dict[str, np.ndarray]) -> MapItems:
+    """Build MapItems from the arrays produced by compile_map."""
+    location_markers: dict[str, list[pg.Vector2]] = {k: [] for k in LOCATIONS.values()}
+    for val, x, y in compiled["location_markers"].tolist():
+        location_markers[LOCATIONS[val]].append(pg.Vector2(x, y))
+
+    return MapItems(
+        [pg.Vector2(x, y) for x, y in compiled["surface_blocks"].tolist()],
+        [pg.Vector2(x, y) for x, y in compiled["mock_surface_blocks"].tolist()],
+        location_markers,
+    )
+
+
 @lru_cache
 def surface_blocks() -> MapItems:
-    w_array = world_array()
-
-    locations = {
-        0xA0: "Limtoc crater",
-        0xA1: "Stickney east",
-        0xA2: "Stickney west",
-        0xA3: "The monolith",
-        0xA4: "The base",
-    }
-
-    rock_locations = []
-    mock_rock_locations = []
-    location_markers: dict[str, list[pg.Vector2]] = {k: [] for k in locations.values()}
-
-    i_max, j_max = w_array.shape
-
-    for i in range(i_max):
-        for j in range(j_max):
-            val = w_array[i][j]
-            match val & 0xF0:
-                case 0:
-                    rock_locations.append(pg.Vector2(j, i))
-                case 0xF0:
-                    if val == 0xF0:  # TODO fix hack, change 0xF0 for mock block
-                        mock_rock_locations.append(pg.Vector2(j, i))
-                case 0xA0:
-                    location_markers[locations[val]].append(pg.Vector2(j, i))
-
-    return MapItems(rock_locations, mock_rock_locations, location_markers)
+    return map_items(compiled_world())
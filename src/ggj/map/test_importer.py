@@ -1,7 +1,56 @@
-from ggj.map.importer import surface_blocks
+import numpy as np
+import pytest
 
+from ggj.map import importer
+from ggj.map.importer import (
+    WORLD_PNG_PATH,
+    compile_map,
+    compiled_map_path,
+    load_compiled_map,
+    map_items,
+    surface_blocks,
+    world_rgb_array,
+)
 
-def test_surface_blocks():
+
+def test_surface_blocks(monkeypatch, tmp_path):
+    # compiling the map caches it, keep that out of the real cache
+    monkeypatch.setenv("GGJ_CACHE_DIR", str(tmp_path / "cache"))
     blocks = surface_blocks().surface_blocks
     assert len(blocks) > 0
     assert len(blocks) < 100 * 1000
+
+
+def test_compile_map_matches_pixels():
+    w_array = np.ascontiguousarray(world_rgb_array()[:, :, 0])
+    items = map_items(compile_map(w_array))
+
+    # reference per-pixel walk over the map
+    rocks, mocks, markers = [], [], 0
+    for (i, j), val in np.ndenumerate(w_array):
+        if val & 0xF0 == 0:
+            rocks.append((j, i))
+        elif val == 0xF0:
+            mocks.append((j, i))
+        elif val & 0xF0 == 0xA0:
+            markers += 1
+
+    assert [tuple(v) for v in items.surface_blocks] == rocks
+    assert [tuple(v) for v in items.mock_surface_blocks] == mocks
+    assert sum(len(vs) for vs in items.location_markers.values()) == markers
+
+
+def test_compiled_map_loaded_from_cache(monkeypatch, tmp_path):
+    cold = load_compiled_map(WORLD_PNG_PATH, tmp_path)
+    assert compiled_map_path(WORLD_PNG_PATH, tmp_path).exists()
+
+    def not_cached(*args):
+        pytest.fail("compiled map wasn't loaded from the cache")
+
+    monkeypatch.setattr(importer, "compile_map", not_cached)
+    monkeypatch.setattr(importer, "_decode_world_png", not_cached)
+    warm = load_compiled_map(WORLD_PNG_PATH, tmp_path)
+
+    assert cold.keys() == warm.keys()
+    for k in cold:
+        assert np.array_equal(cold[k], warm[k])
@@ -1,19 +1,27 @@
 import enum
+from functools import lru_cache
 import pygame as pg
 import pygame.transform
-from typing import cast
+from typing import Optional
 
 from ggj.camera import camera, screen_to_world_vector2
-from ggj.assets import SPRITE_SHEET_PATH, GRAPPLE_PATH, WALKING_PATH
-from ggj.constants import FPS
+from ggj.canvas import Canvas
+from ggj.assets import SPRITE_SHEET_PATH, GRAPPLE_PATH, WALKING_PATH, load_sound
+from ggj.audio import audio_manager
+from ggj.baked import load_baked
+from ggj.constants import PHYSICS_HZ
 from ggj.keys import key_manager, key_map
+from ggj.log import RateLimitedLogger
 from ggj.game_object import GameObject, PhysicsBody, PointMass, Drawable
-from ggj.world import SURFACE_BLOCK_SIZE, SurfaceBlock
-from ggj.collision import collision_object_manager, point_collide_group
+from ggj.world import SURFACE_BLOCK_SIZE
+from ggj.collision import collision_object_manager
 from ggj.telegraph import telegraph_placer
+from ggj.tilemap import RayHit, TileMap
 import logging
 
 logger = logging.getLogger(__name__)
+# for logging every physics step
+step_logger = RateLimitedLogger(logger)
 
 PLAYER_MAX_SPEED = 20
 PLAYER_MASS = 10
@@ -46,8 +54,18 @@ class FacingDirection(enum.Enum):
     LEFT = 2
 
 
-def _load_sprite_sheet() -> list[pg.Surface]:
-    sheet = pg.image.load(SPRITE_SHEET_PATH).convert_alpha()
+@lru_cache
+def load_sprite_sheet() -> list[pg.Surface]:
+    return load_baked(
+        "player",
+        SPRITE_SHEET_PATH,
+        (SPRITE_WIDTH, SPRITE_HEIGHT, SPRITE_SCALE, SPRITE_WALKING_BOB_PX),
+        _build_sprites,
+    )
+
+
+def _build_sprites(sheet: pg.Surface) -> list[pg.Surface]:
+    sheet = sheet.convert_alpha()
 
     if sheet.get_width() % SPRITE_WIDTH != 0 or sheet.get_height() != SPRITE_HEIGHT:
         raise ValueError(f"Sprite sheet has wrong dims, {sheet.get_rect()}")
@@ -83,14 +101,14 @@ class Player(pg.sprite.Sprite, GameObject, PhysicsBody):
 
         # sound fx
 
-        self.grapple_sound = pygame.mixer.Sound(GRAPPLE_PATH)
+        self.grapple_sound = load_sound(GRAPPLE_PATH)
         self.grapple_sound.set_volume(0.1)
-        self.walking_sound = pygame.mixer.Sound(WALKING_PATH)
+        self.walking_sound = load_sound(WALKING_PATH)
         self.walking_sound.set_volume(0.06)
 
         # sprite and animation stuff, first load sheet and generate left and right sprites
 
-        all_sprites = _load_sprite_sheet()
+        all_sprites = load_sprite_sheet()
         self._right_walking_sprites = all_sprites[:WALKING_SPRITE_COUNT]
         self._left_walking_sprites = [
             pygame.transform.flip(s, flip_x=True, flip_y=False)
@@ -110,15 +128,20 @@ class Player(pg.sprite.Sprite, GameObject, PhysicsBody):
             start_pos,
             PLAYER_MASS,
         )
+        self._grapple_hit: Optional[RayHit] = None
         self._populate_rect()
 
-    def _populate_rect(self):
-        screen_rect = camera.get_screen_rect(self.world_rect)
+    def _populate_rect(self, world_rect: Optional[pg.Rect] = None):
+        screen_rect = camera.get_screen_rect(world_rect or self.world_rect)
         self.rect.bottom = screen_rect.bottom
         self.rect.centerx = screen_rect.centerx
 
+    def interpolate(self, alpha: float) -> None:
+        position = self._point_mass.interpolated_position(alpha)
+        self._populate_rect(self._world_rect_at(position))
+
     def _place_telegraph(self) -> None:
-        assert (mouse_pos := key_manager.get_right_up_pos()) is not None
+        assert (mouse_pos := key_manager.pop_right_up_pos()) is not None
         position = pg.Vector2(mouse_pos)
         telegraph_placer.add(position)
 
@@ -139,9 +162,10 @@ class Player(pg.sprite.Sprite, GameObject, PhysicsBody):
         # animations
 
         if self._is_moving():
-            self.walking_sound.play(loops=-1)
+            audio_manager.start_loop("walking", self.walking_sound)
             if (
-                self._animation_ticks_count % (int(FPS * SPRITE_WALKING_FREQUENCY**-1))
+                self._animation_ticks_count
+                % (int(PHYSICS_HZ * SPRITE_WALKING_FREQUENCY**-1))
                 == 0
             ):
                 self._current_walking_sprite_index = (
@@ -152,18 +176,13 @@ class Player(pg.sprite.Sprite, GameObject, PhysicsBody):
         elif self._is_grappling_hook():
             self.image = self.grappling_sprite
         else:
-            self.walking_sound.stop()
+            audio_manager.stop_loop("walking")
             self.image = self._walking_sprites[self._current_walking_sprite_index]
 
     def update(self) -> None:
         self._handle_animations()
         walking_force = pg.Vector2(0, 0)
 
-        # check for collisions against surfaces
-        surfaces = collision_object_manager.get(SurfaceBlock)
-        collide_surfaces = []
-        if surfaces is not None:
-            collide_surfaces = pg.sprite.spritecollide(self, surfaces, False)
         if (
             self._point_mass.velocity.x >= 0
             or abs(self._point_mass.velocity.x) < PLAYER_MAX_SPEED
@@ -182,24 +201,29 @@ class Player(pg.sprite.Sprite, GameObject, PhysicsBody):
         self._point_mass.add_force(air_resist_force)
         self._point_mass.add_force(WALKING_FORCE_MULTIPLIER * walking_force)
 
+        # cast once per frame, shared with the grappling hook drawing
+        self._grapple_hit = self._find_grapple_hit()
         if self.can_grapple():
             self._grapple()
 
         self._point_mass.apply_gravity()
 
-        for surface in collide_surfaces:
-            self._on_collide_surface(cast(SurfaceBlock, surface))
+        # check for collisions against surfaces
+        if (tilemap := collision_object_manager.tilemap) is not None:
+            self._collide_surfaces(tilemap)
 
         if key_manager.get_right_up_pos() is not None:
             self._place_telegraph()
 
-        self._populate_rect()
-
     @property
     def world_rect(self) -> pg.Rect:
+        return self._world_rect_at(self._point_mass.position)
+
+    @staticmethod
+    def _world_rect_at(position: pg.Vector2) -> pg.Rect:
         return pg.Rect(
-            round(self._point_mass.position.x - (SURFACE_BLOCK_SIZE[0] / 2)),
-            round(self._point_mass.position.y - (SURFACE_BLOCK_SIZE[0] / 2)),
+            round(position.x - (SURFACE_BLOCK_SIZE[0] / 2)),
+            round(position.y - (SURFACE_BLOCK_SIZE[0] / 2)),
             *SURFACE_BLOCK_SIZE,
         )
 
@@ -212,18 +236,24 @@ class Player(pg.sprite.Sprite, GameObject, PhysicsBody):
     def _is_grappling_hook(self) -> bool:
         return key_manager.get_mouse_down_pos() is not None
 
-    def _on_collide_surface(self, surface: SurfaceBlock) -> None:
+    def _collide_surfaces(self, tilemap: TileMap) -> None:
         player_world_bounds = self.world_rect
-        other_world_bounds = surface.world_rect
+        centerx, centery = player_world_bounds.center
 
         # check for collision above the player
-        if other_world_bounds.clipline(
-            (player_world_bounds.centerx, player_world_bounds.centery),
-            (player_world_bounds.centerx, player_world_bounds.top),
+        if above := tilemap.tiles_overlapping(
+            pg.Rect(
+                centerx,
+                player_world_bounds.top,
+                1,
+                centery - player_world_bounds.top + 1,
+            )
         ):
-            self._point_mass.velocity.y = 0
-            self._point_mass.position.y = other_world_bounds.bottom + (
-                SURFACE_BLOCK_SIZE[1] / 2
+            # the lowest tile is the one the player is pushed out of
+            ceiling = tilemap.tile_rect(*max(above, key=lambda t: t[1]))
+            self._point_mass.set_velocity(y=0)
+            self._point_mass.set_position(
+                y=ceiling.bottom + (SURFACE_BLOCK_SIZE[1] / 2)
             )
             # only apply if the force is going down, if we are jumping we want to
             # remove away from the object.
@@ -233,18 +263,21 @@ class Player(pg.sprite.Sprite, GameObject, PhysicsBody):
                 )
 
         # check for collision below the player
-        if other_world_bounds.clipline(
-            (player_world_bounds.centerx, player_world_bounds.centery),
-            (player_world_bounds.centerx, player_world_bounds.bottom),
+        if below := tilemap.tiles_overlapping(
+            pg.Rect(
+                centerx,
+                centery,
+                1,
+                player_world_bounds.bottom - centery + 1,
+            )
         ):
             if self._is_player_jumping():
-                logging.debug(self._point_mass._accumulative_force)
-                self._point_mass.add_force(JUMP_FORCE)
+                step_logger.debug("jumping with force %s", self._point_mass.get_force())
+                self._point_mass.add_impulse(JUMP_FORCE, 1.0 / PHYSICS_HZ)
 
-            self._point_mass.velocity.y = 0
-            self._point_mass.position.y = other_world_bounds.top - (
-                SURFACE_BLOCK_SIZE[1] / 2
-            )
+            ground = tilemap.tile_rect(*min(below, key=lambda t: t[1]))
+            self._point_mass.set_velocity(y=0)
+            self._point_mass.set_position(y=ground.top - (SURFACE_BLOCK_SIZE[1] / 2))
             # only apply if the force is going down, if we are jumping we want to
             # remove away from the object.
             if self._point_mass.get_force().y > 0:
@@ -255,13 +288,18 @@ class Player(pg.sprite.Sprite, GameObject, PhysicsBody):
                 pg.Vector2(-self._point_mass.velocity.x, 0) * FRICTION_MULTIPLIER
             )
             self._point_mass.add_force(friction_force)
-            logger.debug(f"accumulative force: {self._point_mass._accumulative_force}")
+            step_logger.debug("accumulative force: %s", self._point_mass.get_force())
+
         # we are to the right of the surface.
-        if other_world_bounds.clipline(
-            (player_world_bounds.left, player_world_bounds.centery),
-            (player_world_bounds.centerx, player_world_bounds.centery),
+        if tilemap.tiles_overlapping(
+            pg.Rect(
+                player_world_bounds.left,
+                centery,
+                centerx - player_world_bounds.left + 1,
+                1,
+            )
         ):
-            self._point_mass.velocity.x = 0
+            self._point_mass.set_velocity(x=0)
             # only apply the force if the force is going into this object
             if self._point_mass.get_force().x < 0:
                 self._point_mass.add_force(
@@ -269,62 +307,81 @@ class Player(pg.sprite.Sprite, GameObject, PhysicsBody):
                 )
 
         # we are to the left of the object
-        if other_world_bounds.clipline(
-            (player_world_bounds.right, player_world_bounds.centery),
-            (player_world_bounds.centerx, player_world_bounds.centery),
+        if tilemap.tiles_overlapping(
+            pg.Rect(
+                centerx,
+                centery,
+                player_world_bounds.right - centerx + 1,
+                1,
+            )
         ):
-            self._point_mass.velocity.x = 0
+            self._point_mass.set_velocity(x=0)
             if self._point_mass.get_force().x > 0:
                 self._point_mass.add_force(
                     pg.Vector2(-self._point_mass.get_force().x, 0)
                 )
 
+    @property
+    def sprites(self) -> list[pg.Surface]:
+        return [
+            *self._right_walking_sprites,
+            *self._left_walking_sprites,
+            self.grappling_sprite,
+        ]
+
     @property
     def point_mass(self) -> PointMass:
         return self._point_mass
 
+    @property
+    def grapple_hit(self) -> Optional[RayHit]:
+        """Where the grappling hook is attached this frame, if anywhere."""
+        return self._grapple_hit
+
     def can_grapple(self) -> bool:
-        """True if the player is pressing right-click and surface is reachable"""
+        """True if the player is pressing left-click and a surface is reachable"""
+        return self._grapple_hit is not None
+
+    def _find_grapple_hit(self) -> Optional[RayHit]:
+        """Cast the grappling hook from the player towards the mouse."""
         if (mouse_pos := key_manager.get_mouse_down_pos()) is None:
-            return False
+            return None
 
         # mouse position in the world
         mouse_vec = pg.Vector2(*mouse_pos)
         mouse_world_pos = screen_to_world_vector2(mouse_vec)
-        logging.debug(
-            f"mouse coords: {mouse_vec}, mouse world coords: {mouse_world_pos}"
+        step_logger.debug(
+            "mouse coords: %s, mouse world coords: %s", mouse_vec, mouse_world_pos
         )
 
         # Check the distance. If the player can't reach the object then the
         # player can't grapple.
-        if (
-            distance := (mouse_world_pos - self._point_mass.position).magnitude()
-        ) > MAX_GRAPPLE_DISTANCE:
-            logger.debug(
-                f"player cannot grapple distance: {distance} > {MAX_GRAPPLE_DISTANCE}"
+        to_mouse = mouse_world_pos - self._point_mass.position
+        if (distance := to_mouse.magnitude()) > MAX_GRAPPLE_DISTANCE:
+            step_logger.debug(
+                "player cannot grapple distance: %s > %s",
+                distance,
+                MAX_GRAPPLE_DISTANCE,
             )
-            return False
+            return None
 
-        # Check that the mouse hovers over a surface object.
-        blocks = collision_object_manager.get(SurfaceBlock)
-        assert blocks is not None
+        if (tilemap := collision_object_manager.tilemap) is None:
+            return None
 
-        # We can only use the grappling hook if it can actually attach to something.
-        mouse_collisions = point_collide_group(mouse_vec, blocks)
-        logger.debug(
-            f"number of grapple collisions with surface blocks: {mouse_collisions}"
-        )
-
-        return len(mouse_collisions) > 0
+        # The hook attaches to the first surface along the rope, which has to
+        # be no further away than the mouse.
+        hit = tilemap.raycast(self._point_mass.position, to_mouse, distance)
+        step_logger.debug("grapple raycast hit: %s", hit)
+        return hit
 
     def _grapple(self) -> None:
-        self.grapple_sound.play()
-        mouse_down_pos = key_manager.get_mouse_down_pos()
-        assert mouse_down_pos
-        world_pos_mouse = screen_to_world_vector2(pg.Vector2(*mouse_down_pos))
-        distance = world_pos_mouse - self._point_mass.position
+        assert self._grapple_hit is not None
+        audio_manager.play_once("grapple", self.grapple_sound)
+        distance = self._grapple_hit.point - self._point_mass.position
         spring_force = SPRING_CONSTANT * distance
-        logger.debug(f"spring applying force {spring_force} distance {distance}")
+        step_logger.debug(
+            "spring applying force %s distance %s", spring_force, distance
+        )
         self._point_mass.add_force(spring_force)
 
 
@@ -334,20 +391,25 @@ class GrapplingHook(Drawable):
     def __init__(self, player: Player) -> None:
         self.player = player
 
-    def draw(self, screen: pg.Surface) -> None:
+    def _screen_line(self) -> Optional[tuple[tuple[int, int], tuple[int, int]]]:
         # If the grappling hook isn't being triggered.
         # then there is nothing to do.
-        if not self.player.can_grapple():
-            return
-
-        mouse_pos = key_manager.get_mouse_down_pos()
-        assert mouse_pos
+        if (hit := self.player.grapple_hit) is None:
+            return None
 
         player_world_rect = self.player.world_rect
         start_coords = camera.get_screen_rect(pg.Rect(*player_world_rect.center, 0, 0))
-        pg.draw.line(
-            screen,
-            (255, 0, 0),
-            (start_coords.x, start_coords.y),
-            mouse_pos,
-        )
+        end_coords = camera.get_screen_rect(pg.Rect(hit.point, (0, 0)))
+        return (start_coords.x, start_coords.y), (end_coords.x, end_coords.y)
+
+    def screen_rect(self) -> Optional[pg.Rect]:
+        """Screen area the line will be drawn over, if it's drawn at all."""
+        if (line := self._screen_line()) is None:
+            return None
+        (x1, y1), (x2, y2) = line
+        return pg.Rect(min(x1, x2), min(y1, y2), abs(x2 - x1) + 1, abs(y2 - y1) + 1)
+
+    def draw(self, canvas: Canvas) -> None:
+        if (line := self._screen_line()) is None:
+            return
+        canvas.draw_line((255, 0, 0), *line)
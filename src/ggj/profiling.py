@@ -0,0 +1,89 @@
+import io
+import logging
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+
+# the profiler is imported when it's first used, to keep startup quick
+if TYPE_CHECKING:
+    import cProfile
+
+logger = logging.getLogger(__name__)
+
+# Functions listed in the text summary of a capture.
+SUMMARY_FUNCTIONS = 25
+
+
+class ProfileCapture:
+    """
+    Profiles a number of frames of the main loop on demand, writing the
+    stats to a .pstats file and a readable summary next to it.
+    """
+
+    _profile: Optional["cProfile.Profile"]
+
+    def __init__(self, frames: int, directory: Path):
+        """
+        Args:
+            frames: Frames profiled before the capture stops by itself.
+            directory: Where captures are written.
+        """
+        self.frames = frames
+        self.directory = directory
+        self._profile = None
+        self._frames_left = 0
+
+    @property
+    def active(self) -> bool:
+        return self._profile is not None
+
+    def start(self) -> None:
+        import cProfile
+
+        logger.info(f"profiling the next {self.frames} frames")
+        self._frames_left = self.frames
+        self._profile = cProfile.Profile()
+        self._profile.enable()
+
+    def end_frame(self) -> bool:
+        """Count a frame, returns True once enough frames are captured."""
+        if self._profile is None:
+            return False
+        self._frames_left -= 1
+        return self._frames_left <= 0
+
+    def stop(self, tag: str) -> Path:
+        """
+        Stop capturing and write out what was captured.
+
+        Args:
+            tag: Where the capture was taken, put at the top of the summary.
+
+        Returns:
+            Path of the .pstats file.
+        """
+        import pstats
+
+        assert self._profile is not None
+        self._profile.disable()
+        profile, self._profile = self._profile, None
+        frames = self.frames - self._frames_left
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # captures in the same second are numbered, rather than overwritten
+        stamp = time.strftime("ggj-%Y%m%d-%H%M%S")
+        name, number = stamp, 1
+        while (self.directory / f"{name}.pstats").exists():
+            number += 1
+            name = f"{stamp}-{number}"
+        stats_path = self.directory / f"{name}.pstats"
+        profile.dump_stats(stats_path)
+
+        summary = io.StringIO()
+        summary.write(f"{frames} frames, {tag}\n\n")
+        stats = pstats.Stats(profile, stream=summary)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(SUMMARY_FUNCTIONS)
+        (self.directory / f"{name}.txt").write_text(summary.getvalue())
+
+        logger.info(f"wrote profile of {frames} frames to {stats_path}")
+        return stats_path
@@ -0,0 +1,124 @@
+import logging
+from collections import deque
+from typing import NamedTuple, Optional
+
+from ggj.constants import FPS
+
+logger = logging.getLogger(__name__)
+
+# Frames of timings looked at before deciding to change quality.
+QUALITY_WINDOW = 60
+
+# Quality goes down when the average frame takes more than this much of the
+# frame budget...
+DOWNGRADE_LOAD = 0.9
+# ...and only back up when it's been well under it for a few windows in a
+# row, so it doesn't flip flop.
+UPGRADE_LOAD = 0.5
+UPGRADE_WINDOWS = 3
+
+
+class QualityLevel(NamedTuple):
+    name: str
+    # only every nth star tile is drawn
+    star_stride: int
+    draw_mars: bool
+    # smooth filtering when scaling the frame up to the window
+    smooth: bool
+
+
+# Every step down draws less, smoothing alone costs nothing unless the frame
+# is scaled to the window.
+QUALITY_LEVELS = [
+    QualityLevel("high", star_stride=1, draw_mars=True, smooth=True),
+    QualityLevel("medium", star_stride=2, draw_mars=True, smooth=False),
+    QualityLevel("low", star_stride=3, draw_mars=True, smooth=False),
+    QualityLevel("lowest", star_stride=3, draw_mars=False, smooth=False),
+]
+
+
+class QualityGovernor:
+    """
+    Watches how long frames take to make and steps quality down when they
+    go over budget, and back up when there's plenty of time to spare.
+    """
+
+    def __init__(
+        self,
+        budget_seconds: float = 1.0 / FPS,
+        adaptive: bool = True,
+        window: int = QUALITY_WINDOW,
+    ):
+        """
+        Args:
+            budget_seconds: How long a frame can take.
+            adaptive: Whether to change level at all.
+            window: Frames averaged over before changing level.
+        """
+        self.budget_seconds = budget_seconds
+        self.adaptive = adaptive
+        self._index = 0
+        self._samples: deque[float] = deque(maxlen=window)
+        self._quiet_windows = 0
+
+    @property
+    def level(self) -> QualityLevel:
+        return QUALITY_LEVELS[self._index]
+
+    def configure(self, setting: str) -> None:
+        """
+        Fix the level by name, or adapt it to frame times if setting is
+        "auto". Unknown names are warned about and treated as "auto".
+        """
+        names = [level.name for level in QUALITY_LEVELS]
+        if setting in names:
+            self.adaptive = False
+            self.set_level(setting)
+            return
+        if setting != "auto":
+            logger.warning(
+                f"unknown quality {setting}, using auto, levels are {', '.join(names)}"
+            )
+        self.adaptive = True
+
+    def set_level(self, name: str) -> None:
+        self._index = [level.name for level in QUALITY_LEVELS].index(name)
+        self._samples.clear()
+        self._quiet_windows = 0
+        logger.info(f"quality set to {self.level.name}")
+
+    def record(self, busy_seconds: float) -> Optional[QualityLevel]:
+        """
+        Record how long the last frame took to make, not counting time spent
+        waiting for the next one.
+
+        Returns:
+            The new level if it changed.
+        """
+        if not self.adaptive:
+            return None
+
+        self._samples.append(busy_seconds)
+        if len(self._samples) < (self._samples.maxlen or 0):
+            return None
+
+        load = sum(self._samples) / len(self._samples) / self.budget_seconds
+        self._samples.clear()
+        logger.debug(
+            "frames at %.0f%% of budget, quality %s", load * 100, self.level.name
+        )
+
+        self._quiet_windows = self._quiet_windows + 1 if load < UPGRADE_LOAD else 0
+        if load > DOWNGRADE_LOAD and self._index < len(QUALITY_LEVELS) - 1:
+            self._index += 1
+        elif self._quiet_windows >= UPGRADE_WINDOWS and self._index > 0:
+            self._index -= 1
+        else:
+            return None
+
+        self._quiet_windows = 0
+        logger.info(f"frames at {load:.0%} of budget, quality now {self.level.name}")
+        return self.level
+
+
+quality_governor = QualityGovernor()
@@ -0,0 +1,192 @@
+import logging
+from typing import TYPE_CHECKING, Optional, Protocol
+
+import pygame as pg
+
+from ggj.camera import CameraTransform, camera
+from ggj.canvas import Canvas, DisplayCanvas, SurfaceCanvas
+from ggj.telegraph import telegraph_placer
+from ggj.timings import frame_timer
+
+if TYPE_CHECKING:
+    from ggj.main import Game
+    from ggj.ui.loading_bar import LoadingBar
+
+logger = logging.getLogger(__name__)
+
+
+class Renderer(Protocol):
+    """Gets frames onto the display."""
+
+    def draw_menu(
+        self, image: pg.Surface, loading_bar: Optional["LoadingBar"] = None
+    ) -> None: ...
+
+    def draw_game(self, game: "Game", alpha: float) -> None: ...
+
+    def invalidate(self) -> None:
+        """Forget what's on screen, the next frame is drawn in full."""
+        ...
+
+
+class FullRenderer(Renderer):
+    """Redraws and presents the whole screen every frame."""
+
+    def __init__(self, canvas: Canvas):
+        self.canvas = canvas
+
+    def draw_menu(
+        self, image: pg.Surface, loading_bar: Optional["LoadingBar"] = None
+    ) -> None:
+        self.canvas.fill((0, 0, 0))
+        self.canvas.blit(image, image.get_rect())
+        if loading_bar is not None:
+            self.canvas.blit(
+                loading_bar.image, loading_bar.rect, version=loading_bar.revision
+            )
+        self.canvas.present()
+
+    def draw_game(self, game: "Game", alpha: float) -> None:
+        self.canvas.fill((0, 0, 0))
+        game.draw(self.canvas, alpha)
+        self.canvas.present()
+        frame_timer.lap("present")
+
+    def invalidate(self) -> None:
+        pass
+
+
+class DirtyRectRenderer(Renderer):
+    """
+    Only redraws the parts of the screen that changed.
+
+    While the camera moves everything is redrawn and flipped. Once it has been
+    still for a frame the layers under and over the moving sprites are cached,
+    and each frame only the areas the player and grapple line were in, and
+    are in now, are restored from the caches and updated on the display.
+    """
+
+    _below: Optional[pg.Surface]
+    _above: Optional[pg.Surface]
+    _transform: Optional[CameraTransform]
+
+    def __init__(self, canvas: SurfaceCanvas) -> None:
+        self.canvas = canvas
+        self._menu_drawn = False
+        self._menu_revision = 0
+        self._below = None
+        self._above = None
+        self._transform = None
+        self._poles_revision = -1
+        self._ui_revision = -1
+        self._moving: list[pg.Rect] = []
+
+    def invalidate(self) -> None:
+        self._menu_drawn = False
+        self._below = None
+        self._above = None
+        self._transform = None
+
+    def draw_menu(
+        self, image: pg.Surface, loading_bar: Optional["LoadingBar"] = None
+    ) -> None:
+        # the menu only changes with the loading bar
+        revision = loading_bar.revision if loading_bar is not None else 0
+        if self._menu_drawn and revision == self._menu_revision:
+            return
+        self.canvas.fill((0, 0, 0))
+        self.canvas.blit(image, image.get_rect())
+        if loading_bar is not None:
+            self.canvas.blit(loading_bar.image, loading_bar.rect)
+        self.canvas.present()
+        self._menu_drawn = True
+        self._menu_revision = revision
+
+    def draw_game(self, game: "Game", alpha: float) -> None:
+        screen = self.canvas.surface
+        game.interpolate(alpha)
+        moving = game.moving_rects()
+
+        if (
+            camera.transform != self._transform
+            or telegraph_placer.revision != self._poles_revision
+        ):
+            # things are scrolling, caching them would be wasted work
+            self._below = None
+            self._above = None
+            self._transform = camera.transform
+            self._poles_revision = telegraph_placer.revision
+            self._draw_full(screen, game)
+        elif self._below is None or self._above is None:
+            self._cache_layers(screen, game)
+            self._draw_full(screen, game)
+        else:
+            self._draw_dirty(screen, game, self._below, self._above, moving)
+
+        self._moving = moving
+        self._ui_revision = game.user_interface.revision
+
+    def _draw_full(self, screen: pg.Surface, game: "Game") -> None:
+        canvas = self.canvas
+        if self._below is not None and self._above is not None:
+            screen.blit(self._below, (0, 0))
+            game.draw_objects(canvas)
+            screen.blit(self._above, (0, 0))
+        else:
+            canvas.fill((0, 0, 0))
+            game.draw_background(canvas)
+            game.draw_objects(canvas)
+            game.draw_foreground(canvas)
+        game.draw_overlay(canvas)
+        canvas.present()
+        frame_timer.lap("present")
+
+    def _cache_layers(self, screen: pg.Surface, game: "Game") -> None:
+        logger.debug("camera is still, caching background layers")
+        below = pg.Surface(screen.get_size()).convert(screen)
+        game.draw_background(SurfaceCanvas(below))
+        above = pg.Surface(screen.get_size(), pg.SRCALPHA).convert_alpha(screen)
+        above.fill((0, 0, 0, 0))
+        game.draw_foreground(SurfaceCanvas(above))
+        self._below = below
+        self._above = above
+
+    def _draw_dirty(
+        self,
+        screen: pg.Surface,
+        game: "Game",
+        below: pg.Surface,
+        above: pg.Surface,
+        moving: list[pg.Rect],
+    ) -> None:
+        screen_rect = screen.get_rect()
+        dirty = [r.clip(screen_rect) for r in self._moving + moving]
+        dirty = [r for r in dirty if r.width and r.height]
+
+        # restore the layers in one go, the moving things are close together
+        areas = [dirty[0].unionall(dirty[1:])] if dirty else []
+        # see-through parts of the interface would be drawn over themselves
+        areas.extend(game.user_interface.translucent_rects())
+        for area in areas:
+            screen.blit(below, area, area)
+            screen.set_clip(area)
+            game.draw_objects(self.canvas)
+            screen.set_clip(None)
+            screen.blit(above, area, area)
+
+        game.draw_overlay(self.canvas)
+
+        if game.user_interface.revision != self._ui_revision:
+            dirty.extend(game.user_interface.rects())
+
+        self.canvas.present(dirty)
+        frame_timer.lap("present")
+
+
+def make_renderer(canvas: Canvas, dirty_rects: bool) -> Renderer:
+    if dirty_rects:
+        if isinstance(canvas, DisplayCanvas):
+            logger.info("rendering with dirty rects")
+            return DirtyRectRenderer(canvas)
+        logger.warning("dirty rects only work with the software backend")
+    return FullRenderer(canvas)
@@ -0,0 +1,142 @@
+import logging
+import struct
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+from ggj.keys import InputState
+
+logger = logging.getLogger(__name__)
+
+RECORDING_MAGIC = b"GGJR"
+RECORDING_VERSION = 2
+
+# magic, version, terrain seed, frame count, resolution
+_HEADER = struct.Struct("<4sHQIHH")
+# frame seconds, player x and y after the frame, input flags, then the three
+# mouse positions and the number of keys down and pressed
+_FRAME = struct.Struct("<dddBhhhhhhBB")
+
+_QUIT = 1
+_LEFT_DOWN = 2
+_RIGHT_DOWN = 4
+_RIGHT_UP = 8
+
+
+class FrameRecord(NamedTuple):
+    # time since the previous frame, fed to the fixed step accumulator
+    frame_seconds: float
+    input: InputState
+    # where the player ended up, to check replays against
+    player_position: tuple[float, float]
+
+
+class Recording:
+    """
+    Input for every frame of a game, and where the player got to, in a
+    compact binary file. Replaying the input with the same seed, frame times
+    and resolution gives the same trajectory.
+    """
+
+    def __init__(
+        self,
+        seed: int,
+        resolution: tuple[int, int],
+        frames: Optional[list[FrameRecord]] = None,
+    ):
+        """
+        Args:
+            seed: Seed for the terrain's random tile variants.
+            resolution: Resolution the game was drawn at. Mouse positions
+                are on a screen this size, so replays have to be drawn at it.
+            frames: Frames recorded so far.
+        """
+        self.seed = seed
+        self.resolution = resolution
+        self.frames = frames if frames is not None else []
+
+    def __len__(self) -> int:
+        return len(self.frames)
+
+    def append(
+        self,
+        frame_seconds: float,
+        input: InputState,
+        player_position: tuple[float, float],
+    ) -> None:
+        self.frames.append(FrameRecord(frame_seconds, input, player_position))
+
+    def save(self, path: Path) -> None:
+        chunks = [
+            _HEADER.pack(
+                RECORDING_MAGIC,
+                RECORDING_VERSION,
+                self.seed,
+                len(self),
+                *self.resolution,
+            )
+        ]
+        for frame in self.frames:
+            state = frame.input
+            flags = (
+                (_QUIT if state.is_quit else 0)
+                | (_LEFT_DOWN if state.mouse_left_down_pos is not None else 0)
+                | (_RIGHT_DOWN if state.mouse_right_down_pos is not None else 0)
+                | (_RIGHT_UP if state.mouse_right_up_pos is not None else 0)
+            )
+            chunks.append(
+                _FRAME.pack(
+                    frame.frame_seconds,
+                    *frame.player_position,
+                    flags,
+                    *(state.mouse_left_down_pos or (0, 0)),
+                    *(state.mouse_right_down_pos or (0, 0)),
+                    *(state.mouse_right_up_pos or (0, 0)),
+                    len(state.key_down),
+                    len(state.key_pressed),
+                )
+            )
+            keys = (*sorted(state.key_down), *sorted(state.key_pressed))
+            chunks.append(struct.pack(f"<{len(keys)}i", *keys))
+
+        path.write_bytes(b"".join(chunks))
+        logger.info(f"saved recording of {len(self)} frames to {path}")
+
+    @classmethod
+    def load(cls, path: Path) -> "Recording":
+        data = path.read_bytes()
+        magic, version, seed, count, width, height = _HEADER.unpack_from(data)
+        if magic != RECORDING_MAGIC or version != RECORDING_VERSION:
+            raise ValueError(f"{path} isn't a version {RECORDING_VERSION} recording")
+
+        offset = _HEADER.size
+        frames = []
+        for _ in range(count):
+            (
+                frame_seconds,
+                x,
+                y,
+                flags,
+                lx,
+                ly,
+                rx,
+                ry,
+                ux,
+                uy,
+                down_count,
+                pressed_count,
+            ) = _FRAME.unpack_from(data, offset)
+            offset += _FRAME.size
+            keys = struct.unpack_from(f"<{down_count + pressed_count}i", data, offset)
+            offset += 4 * len(keys)
+
+            state = InputState(
+                frozenset(keys[:down_count]),
+                frozenset(keys[down_count:]),
+                bool(flags & _QUIT),
+                (lx, ly) if flags & _LEFT_DOWN else None,
+                (rx, ry) if flags & _RIGHT_DOWN else None,
+                (ux, uy) if flags & _RIGHT_UP else None,
+            )
+            frames.append(FrameRecord(frame_seconds, state, (x, y)))
+
+        return cls(seed, (width, height), frames)
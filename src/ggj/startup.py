@@ -0,0 +1,32 @@
+import time
+
+from ggj import IMPORT_STARTED
+
+
+class StartupTimer:
+    """
+    When each step of starting up finished, counted from the ggj package
+    being imported. Steps can finish on any thread.
+    """
+
+    def __init__(self, started: float):
+        self.started = started
+        self.marks: dict[str, float] = {}
+
+    def mark(self, step: str) -> None:
+        """Note that a step is done, only the first mark of a step counts."""
+        self.marks.setdefault(step, time.perf_counter() - self.started)
+
+    def report(self) -> str:
+        """Every step in the order they finished, and the time since the last."""
+        lines = ["startup, from importing ggj:"]
+        previous = 0.0
+        for step, at in sorted(self.marks.items(), key=lambda mark: mark[1]):
+            lines.append(
+                f"  {step:<14} {at * 1000:8.1f}ms  (+{(at - previous) * 1000:.1f}ms)"
+            )
+            previous = at
+        return "\n".join(lines)
+
+
+startup_timer = StartupTimer(IMPORT_STARTED)
@@ -1,9 +1,10 @@
 from ggj import world
-from ggj.game_object import GameObject, PointMass
+from ggj.game_object import GameObject
 import pygame as pg
 import logging
 from ggj.camera import camera, screen_to_world_vector2
 import heapq
+from typing import cast
 from ggj.collision import collision_object_manager
 from ggj.world import SurfaceBlock
 
@@ -12,13 +13,17 @@ logger = logging.getLogger(__name__)
 TELEGRAPH_DIMS = (10, 300)
 COLOR = (211, 211, 211)
 
+# Poles the player has to place.
+POLE_COUNT = 100
+
 
 class TeleGraph(pg.sprite.Sprite, GameObject):
-    _point_mass: PointMass
+    # poles never move by themselves, so they aren't part of the physics world
+    position: pg.Vector2
 
     def __init__(self, position: pg.Vector2):
         pg.sprite.Sprite.__init__(self)
-        self._point_mass = PointMass(position, 20)
+        self.position = position
         self.image = pg.Surface(TELEGRAPH_DIMS)
         self.image.fill(COLOR)
 
@@ -28,30 +33,43 @@ class TeleGraph(pg.sprite.Sprite, GameObject):
     def update(self) -> None:
         self._populate_rect()
 
+    def interpolate(self, alpha: float) -> None:
+        # poles don't move between physics steps, only the camera does
+        self._populate_rect()
+
     @property
     def world_rect(self) -> pg.Rect:
         return pg.Rect(
-            self._point_mass.position.x - (TELEGRAPH_DIMS[0] / 2),
-            self._point_mass.position.y - (TELEGRAPH_DIMS[1] / 2),
+            self.position.x - (TELEGRAPH_DIMS[0] / 2),
+            self.position.y - (TELEGRAPH_DIMS[1] / 2),
             *TELEGRAPH_DIMS,
         )
 
     def __lt__(self, other):
-        our_pos = (self._point_mass.position.x, self._point_mass.position.y)
-        o_pos = (other._point_mass.position.x, other._point_mass.position.y)
+        our_pos = (self.position.x, self.position.y)
+        o_pos = (other.position.x, other.position.y)
         return our_pos.__lt__(o_pos)
 
 
 class TeleGraphPolePlacer:
-    _active_poles: list[TeleGraph]
+    _poles: list[TeleGraph]
+    _unused_poles: list[TeleGraph]
     _sprite_group: pg.sprite.Group
+    # bumped whenever a pole moves, so renderers know to redraw them
+    revision: int
 
     def __init__(self):
-        self._poles = []
+        self.revision = 0
         self._sprite_group = pg.sprite.Group()
+        self.reset()
+
+    def reset(self) -> None:
+        """Take every pole down again, for starting a new game."""
+        self._poles = []
         self._unused_poles = [
-            TeleGraph(pg.Vector2(10000000, 1000000)) for _ in range(100)
+            TeleGraph(pg.Vector2(10000000, 1000000)) for _ in range(POLE_COUNT)
         ]
+        self.revision += 1
 
     def add(self, position: pg.Vector2):
         """Add a telegraph at the mouse position.
@@ -62,27 +80,26 @@ class TeleGraphPolePlacer:
         # maintain poles by position for comparison
         world_pos = screen_to_world_vector2(position)
         logger.debug(
-            f"adding telegraph at screen pos: {position}, world pos: {world_pos}"
+            "adding telegraph at screen pos: %s, world pos: %s", position, world_pos
         )
         pole = self._unused_poles.pop()
-        prev_pos = pole._point_mass.position
-
-        # temporarily modify the display of the pole to check for collision
-        pole._point_mass.position = world_pos
-        pole.rect.x = round(position.x)
-        pole.rect.y = round(position.y)
+        prev_pos = pole.position
+        pole.position = world_pos
+        self.revision += 1
         heapq.heappush(self._poles, pole)
 
-        blocks = collision_object_manager.get(SurfaceBlock)
-        assert blocks
-        if len(collisions := pg.sprite.spritecollide(pole, blocks, False)) == 0:
-            pole._point_mass.position = prev_pos
+        # the pole hangs down from the mouse, check what it would land on
+        collisions = collision_object_manager.query_rect(
+            SurfaceBlock,
+            pg.Rect(round(world_pos.x), round(world_pos.y), *TELEGRAPH_DIMS),
+        )
+        if len(collisions) == 0:
+            pole.position = prev_pos
         else:
             # modify the position of the pole
-            pole._point_mass.position.x = collisions[0].world_rect.centerx
-            pole._point_mass.position.y = collisions[0].world_rect.top - (
-                pole.world_rect.height / 2
-            )
+            landed_on = cast(SurfaceBlock, collisions[0])
+            pole.position.x = landed_on.world_rect.centerx
+            pole.position.y = landed_on.world_rect.top - (pole.world_rect.height / 2)
 
     @property
     def poles(self):
@@ -0,0 +1,240 @@
+import logging
+from collections import OrderedDict
+from typing import Optional
+
+import numpy as np
+import pygame as pg
+
+from ggj.camera import camera
+from ggj.canvas import Canvas
+from ggj.collision import collision_object_manager
+from ggj.world import SURFACE_BLOCK_SIZE, SurfaceBlock, load_surface_block_images
+
+logger = logging.getLogger(__name__)
+
+# Width and height of a chunk in map units (blocks).
+CHUNK_SIZE = 16
+
+# Chunks are loaded once they come within this many pixels of the view port...
+CHUNK_LOAD_MARGIN = SURFACE_BLOCK_SIZE[0] * 4
+# ...and only evicted once they are further away than this, so a player
+# walking back and forth over a chunk boundary doesn't thrash.
+CHUNK_EVICT_MARGIN = SURFACE_BLOCK_SIZE[0] * CHUNK_SIZE
+
+# Baked chunk surfaces kept in memory, enough to cover a large window with
+# some room for walking back and forth.
+BAKED_CHUNK_CACHE_SIZE = 32
+
+ChunkKey = tuple[int, int]
+
+
+def chunk_world_rect(key: ChunkKey) -> pg.Rect:
+    """World rect covered by a chunk. Blocks are centered on their map coords."""
+    width = CHUNK_SIZE * SURFACE_BLOCK_SIZE[0]
+    height = CHUNK_SIZE * SURFACE_BLOCK_SIZE[1]
+    return pg.Rect(
+        key[0] * width - SURFACE_BLOCK_SIZE[0] // 2,
+        key[1] * height - SURFACE_BLOCK_SIZE[1] // 2,
+        width,
+        height,
+    )
+
+
+def chunks_in_rect(rect: pg.Rect) -> set[ChunkKey]:
+    """Keys of every chunk overlapping a rect in world coordinates."""
+    width = CHUNK_SIZE * SURFACE_BLOCK_SIZE[0]
+    height = CHUNK_SIZE * SURFACE_BLOCK_SIZE[1]
+    x_offset = SURFACE_BLOCK_SIZE[0] // 2
+    y_offset = SURFACE_BLOCK_SIZE[1] // 2
+
+    first_x = (rect.left + x_offset) // width
+    last_x = (rect.right - 1 + x_offset) // width
+    first_y = (rect.top + y_offset) // height
+    last_y = (rect.bottom - 1 + y_offset) // height
+
+    return {
+        (x, y) for x in range(first_x, last_x + 1) for y in range(first_y, last_y + 1)
+    }
+
+
+class TerrainLayout:
+    """
+    Every surface block of a map bucketed by chunk, along with the tile
+    variant each block is drawn with.
+    """
+
+    # map coordinates of every block, (N, 2)
+    positions: np.ndarray
+    # tile variant of every block, fixed so a reloaded chunk looks the same
+    variants: np.ndarray
+    # indices into positions for each non-empty chunk
+    _chunk_blocks: dict[ChunkKey, np.ndarray]
+
+    def __init__(
+        self,
+        block_positions: np.ndarray,
+        rng: Optional[np.random.Generator] = None,
+    ):
+        """
+        Args:
+            block_positions: (N, 2) array of block (x, y) map coordinates.
+            rng: Used to pick tile variants.
+        """
+        self.positions = np.asarray(block_positions)
+        rng = rng if rng is not None else np.random.default_rng()
+        self.variants = rng.integers(
+            0, len(load_surface_block_images()), size=len(self.positions)
+        )
+
+        self._chunk_blocks = {}
+        if len(self.positions):
+            keys = self.positions // CHUNK_SIZE
+            order = np.lexsort((keys[:, 1], keys[:, 0]))
+            splits = np.flatnonzero(np.any(np.diff(keys[order], axis=0), axis=1)) + 1
+            for indices in np.split(order, splits):
+                x, y = keys[indices[0]]
+                self._chunk_blocks[(int(x), int(y))] = indices
+
+        logger.info(
+            f"{len(self.positions)} blocks split into {len(self._chunk_blocks)} chunks"
+        )
+
+    def has_blocks(self, key: ChunkKey) -> bool:
+        return key in self._chunk_blocks
+
+    def chunk(self, key: ChunkKey) -> tuple[list[list[int]], list[int]]:
+        """Positions and tile variants of the blocks in a chunk."""
+        if (indices := self._chunk_blocks.get(key)) is None:
+            return [], []
+        return self.positions[indices].tolist(), self.variants[indices].tolist()
+
+
+class ChunkStreamer:
+    """
+    Streams surface blocks in and out of the world in fixed size chunks
+    depending on where the camera is looking.
+
+    Only the blocks of loaded chunks exist as sprites, so the per frame cost
+    depends on the size of the view port rather than the size of the map.
+    """
+
+    _loaded: dict[ChunkKey, list[SurfaceBlock]]
+
+    def __init__(self, layout: TerrainLayout):
+        """
+        Args:
+            layout: The blocks to stream. Loaded blocks are registered for
+                collisions as SurfaceBlocks.
+        """
+        self.layout = layout
+        self.blocks: pg.sprite.Group = pg.sprite.Group()
+        self._loaded = {}
+        collision_object_manager.register(SurfaceBlock, self.blocks)
+
+    @property
+    def loaded_chunks(self) -> set[ChunkKey]:
+        return set(self._loaded)
+
+    def _load(self, key: ChunkKey) -> None:
+        positions, variants = self.layout.chunk(key)
+        chunk = [
+            SurfaceBlock(pg.Vector2(x, y), variant)
+            for (x, y), variant in zip(positions, variants)
+        ]
+        collision_object_manager.add(SurfaceBlock, *chunk)
+        self._loaded[key] = chunk
+        logger.debug("loaded chunk %s with %d blocks", key, len(chunk))
+
+    def _evict(self, key: ChunkKey) -> None:
+        collision_object_manager.remove(SurfaceBlock, *self._loaded.pop(key))
+        logger.debug("evicted chunk %s", key)
+
+    def update(self, view_port: pg.Rect) -> None:
+        """
+        Load chunks near the view port and evict far away ones.
+
+        Args:
+            view_port: The camera's view port in world coordinates.
+        """
+        wanted = chunks_in_rect(
+            view_port.inflate(CHUNK_LOAD_MARGIN * 2, CHUNK_LOAD_MARGIN * 2)
+        )
+        keep = chunks_in_rect(
+            view_port.inflate(CHUNK_EVICT_MARGIN * 2, CHUNK_EVICT_MARGIN * 2)
+        )
+
+        for key in wanted - self._loaded.keys():
+            self._load(key)
+        for key in self._loaded.keys() - keep:
+            self._evict(key)
+
+
+class TerrainRenderer:
+    """
+    Draws terrain one chunk at a time. Each chunk's tiles are baked once into
+    an offscreen surface, so drawing the visible terrain takes a blit per
+    chunk rather than one per block.
+    """
+
+    # most recently used chunks are at the end
+    _baked: OrderedDict[ChunkKey, pg.Surface]
+
+    def __init__(self, layout: TerrainLayout, cache_size: int = BAKED_CHUNK_CACHE_SIZE):
+        """
+        Args:
+            layout: The blocks to draw.
+            cache_size: Maximum number of baked chunks kept around.
+        """
+        self.layout = layout
+        self.cache_size = cache_size
+        self._baked = OrderedDict()
+        self.draw_calls = 0
+
+    def _bake(self, key: ChunkKey) -> pg.Surface:
+        images = load_surface_block_images()
+        surface = pg.Surface(chunk_world_rect(key).size, pg.SRCALPHA)
+
+        positions, variants = self.layout.chunk(key)
+        origin_x, origin_y = key[0] * CHUNK_SIZE, key[1] * CHUNK_SIZE
+        surface.blits(
+            [
+                (
+                    images[variant],
+                    (
+                        (x - origin_x) * SURFACE_BLOCK_SIZE[0],
+                        (y - origin_y) * SURFACE_BLOCK_SIZE[1],
+                    ),
+                )
+                for (x, y), variant in zip(positions, variants)
+            ],
+            doreturn=False,
+        )
+        logger.debug("baked chunk %s", key)
+        return surface.convert_alpha()
+
+    def get_baked(self, key: ChunkKey) -> pg.Surface:
+        """Baked surface of a chunk, baking it if it isn't cached."""
+        if (surface := self._baked.get(key)) is not None:
+            self._baked.move_to_end(key)
+            return surface
+
+        surface = self._baked[key] = self._bake(key)
+        while len(self._baked) > self.cache_size:
+            self._baked.popitem(last=False)
+        return surface
+
+    def draw(self, canvas: Canvas) -> None:
+        keys = [
+            key
+            for key in chunks_in_rect(camera.get_view_port())
+            if self.layout.has_blocks(key)
+        ]
+        self.draw_calls = len(keys)
+        if not keys:
+            return
+
+        world_rects = np.array([tuple(chunk_world_rect(key)) for key in keys])
+        screen_rects = camera.get_screen_rects(world_rects).tolist()
+        canvas.blits(
+            [(self.get_baked(key), rect) for key, rect in zip(keys, screen_rects)]
+        )
@@ -0,0 +1,45 @@
+import pygame as pg
+import pytest
+
+from ggj.audio import AudioManager
+
+
+@pytest.fixture
+def mixer(monkeypatch):
+    monkeypatch.setenv("SDL_AUDIODRIVER", "dummy")
+    pg.mixer.init(frequency=44100, size=-16, channels=2)
+    yield
+    pg.mixer.quit()
+
+
+def test_loops_start_and_stop_on_edges(mixer):
+    audio = AudioManager(loop_channels=1)
+    sound = pg.mixer.Sound(buffer=bytes(44100 * 4))
+
+    for _ in range(3):
+        audio.start_loop("walking", sound)
+    audio.start_loop("humming", sound)
+    for _ in range(3):
+        audio.stop_loop("walking")
+
+    stats = audio.stats()
+    assert stats["loop_starts"] == 1
+    assert stats["loop_stops"] == 1
+    assert stats["loops_unavailable"] == 1
+    assert stats["loops_active"] == 0
+
+
+def test_one_shots_rate_limited(mixer):
+    now = [0.0]
+    audio = AudioManager(clock=lambda: now[0])
+    # a second long
+    sound = pg.mixer.Sound(buffer=bytes(44100 * 4))
+
+    for t in (0.0, 0.5, 1.0, 1.2, 1.4):
+        now[0] = t
+        audio.play_once("grapple", sound)
+    audio.play_once("jump", sound, min_interval=0.0)
+
+    stats = audio.stats()
+    assert stats["one_shots"] == 3
+    assert stats["one_shots_limited"] == 3
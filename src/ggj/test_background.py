@@ -0,0 +1,31 @@
+import pygame as pg
+
+from ggj.background import ParallaxLayer
+from ggj.camera import Camera
+
+
+def test_wrapped_layer_covers_screen_once():
+    camera = Camera()
+    camera.resize((1001, 600))
+    camera.player_box.center = (1234, -567)
+    camera.interpolate(1.0)
+
+    layer = ParallaxLayer(pg.Surface((300, 200)), zindex=3, wrap=True)
+    rects = layer.visible_rects(camera)
+
+    screen = pg.Rect(0, 0, 1001, 600)
+    assert all(r.colliderect(screen) for r in rects)
+    covered = sum(r.clip(screen).width * r.clip(screen).height for r in rects)
+    assert covered == screen.width * screen.height
+
+
+def test_unwrapped_layer_only_drawn_on_screen():
+    camera = Camera()
+    camera.resize((1001, 600))
+    camera.interpolate(1.0)
+
+    layer = ParallaxLayer(pg.Surface((300, 200)), zindex=2, origin=(0, 0))
+    assert len(layer.visible_rects(camera)) == 1
+
+    layer.origin = (100_000, 0)
+    assert layer.visible_rects(camera) == []
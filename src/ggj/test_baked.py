@@ -0,0 +1,44 @@
+import pygame as pg
+import pytest
+
+from ggj.baked import load_baked
+
+
+@pytest.fixture
+def display(monkeypatch, tmp_path):
+    monkeypatch.setenv("SDL_VIDEODRIVER", "dummy")
+    monkeypatch.setenv("GGJ_CACHE_DIR", str(tmp_path / "cache"))
+    pg.display.init()
+    pg.display.set_mode((1, 1))
+    yield
+    pg.display.quit()
+
+
+def test_baked_frames_rebuilt_when_source_changes(display, tmp_path):
+    source = tmp_path / "sheet.png"
+    sheet = pg.Surface((4, 2), pg.SRCALPHA)
+    sheet.fill((10, 20, 30, 128))
+    pg.image.save(sheet, source)
+
+    builds = []
+
+    def build(image):
+        builds.append(image)
+        image = image.convert_alpha()
+        return [image.subsurface(0, 0, 2, 2), pg.transform.scale_by(image, 2)]
+
+    def load():
+        return load_baked("sheet", source, (2,), build)
+
+    frames = load()
+    assert [f.get_size() for f in frames] == [(2, 2), (8, 4)]
+    assert frames[1].get_at((7, 3)) == (10, 20, 30, 128)
+
+    # baked, so it isn't built again
+    assert [f.get_size() for f in load()] == [(2, 2), (8, 4)]
+    assert len(builds) == 1
+
+    sheet.fill((40, 50, 60, 255))
+    pg.image.save(sheet, source)
+    assert load()[0].get_at((0, 0)) == (40, 50, 60, 255)
+    assert len(builds) == 2
@@ -0,0 +1,42 @@
+import pygame as pg
+
+from ggj.benchmark import SCENARIOS, compare, measure, synthetic_map
+from ggj.headless import start_pygame
+from ggj.map.importer import compile_map
+
+
+def test_synthetic_map_has_ground_everywhere():
+    w_array = synthetic_map(1000)
+    compiled = compile_map(w_array)
+
+    assert set(compiled["surface_blocks"][:, 0].tolist()) == set(range(1000))
+    assert len(compiled["location_markers"]) == 5
+    # the player starts at (750, 60)
+    assert (w_array[50:62, 745:756] == 0xFF).all()
+
+
+def test_measure_scenario(monkeypatch, tmp_path):
+    monkeypatch.setenv("SDL_VIDEODRIVER", "dummy")
+    monkeypatch.setenv("SDL_AUDIODRIVER", "dummy")
+    monkeypatch.setenv("GGJ_CACHE_DIR", str(tmp_path / "cache"))
+    canvas = start_pygame()
+    try:
+        result = measure(
+            canvas, compile_map(synthetic_map(1000)), SCENARIOS["poles"], 3, warmup=1
+        )
+    finally:
+        pg.quit()
+
+    assert result["frames"] == 3
+    assert 0 < result["frame_ms"]["p50"] <= result["frame_ms"]["max"]
+    assert "physics" in result["stage_p50_ms"]
+    assert result["alloc_kib_per_frame"]["mean"] > 0
+
+
+def test_compare_flags_slower_scenarios():
+    def result(scenario, p95):
+        return {"map": "world.png", "scenario": scenario, "frame_ms": {"p95": p95}}
+
+    baseline = [result("idle", 2.0), result("walk", 2.0)]
+    regressions = compare([result("idle", 2.1), result("walk", 3.0)], baseline)
+    assert regressions == ["world.png walk: p95 2.000ms -> 3.000ms"]
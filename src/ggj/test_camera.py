@@ -0,0 +1,18 @@
+import numpy as np
+import pygame as pg
+
+from ggj.camera import PARALLAX_LAYERS, Camera
+
+
+def test_screen_rects_match_single_rects():
+    camera = Camera()
+    camera.resize((1001, 600))
+    camera.player_box.center = (1234, -567)
+    camera.interpolate(0.3)
+
+    rects = [pg.Rect(x, y, 48, 10) for x in range(-500, 3000, 317) for y in (-90, 7)]
+    world_rects = np.array([tuple(r) for r in rects])
+
+    for zindex in PARALLAX_LAYERS:
+        batch = camera.get_screen_rects(world_rects, zindex).tolist()
+        assert batch == [list(camera.get_screen_rect(r, zindex)) for r in rects]
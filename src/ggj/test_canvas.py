@@ -0,0 +1,49 @@
+import numpy as np
+import pygame as pg
+
+from ggj.canvas import (
+    GPU_BACKEND,
+    SurfaceCanvas,
+    TextureCanvas,
+    _window_to_canvas,
+    fit_rect,
+    make_canvas,
+)
+
+
+def draw_scene(canvas, image: pg.Surface) -> None:
+    canvas.fill((0, 0, 0))
+    canvas.blits([(image, (10, 10)), (image, pg.Rect(50, 20, 1, 1))])
+    canvas.draw_rect((0, 0, 255), pg.Rect(100, 60, 30, 20))
+    canvas.draw_line((255, 0, 0), (0, 90), (159, 90))
+
+
+def test_gpu_canvas_matches_software(monkeypatch):
+    monkeypatch.setenv("SDL_VIDEODRIVER", "dummy")
+    pg.display.init()
+    try:
+        gpu = make_canvas(GPU_BACKEND, (160, 100), "test")
+        assert isinstance(gpu, TextureCanvas)
+        software = SurfaceCanvas(pg.Surface((160, 100)))
+
+        image = pg.Surface((20, 20), pg.SRCALPHA)
+        image.fill((0, 255, 0, 255), pg.Rect(0, 0, 20, 10))
+
+        for canvas in (gpu, software):
+            draw_scene(canvas, image)
+
+        # drawing the same image again doesn't upload it again
+        assert gpu.uploads == 1
+
+        expected = pg.surfarray.array3d(software.surface)
+        actual = pg.surfarray.array3d(gpu.renderer.to_surface())
+        assert np.array_equal(expected, actual)
+    finally:
+        pg.display.quit()
+
+
+def test_window_to_canvas_letterboxed():
+    # 2x scale, with 40px bars left and right
+    assert fit_rect((640, 360), (1360, 720)) == pg.Rect(40, 0, 1280, 720)
+    assert _window_to_canvas((40, 0), (640, 360), (1360, 720)) == (0, 0)
+    assert _window_to_canvas((1319, 719), (640, 360), (1360, 720)) == (639, 359)
@@ -0,0 +1,30 @@
+import pygame as pg
+
+from ggj.collision import SpatialIndex
+
+
+class Box(pg.sprite.Sprite):
+    def __init__(self, x: int, y: int, size: int = 48):
+        super().__init__()
+        self.world_rect = pg.Rect(x, y, size, size)
+
+
+def test_spatial_index_queries():
+    boxes = [Box(x * 48, y * 48) for x in range(-20, 20) for y in range(5)]
+    index = SpatialIndex()
+    index.add(*boxes)
+    assert len(index) == len(boxes)
+
+    query = pg.Rect(-10, 10, 100, 20)
+    expected = [b for b in boxes if b.world_rect.colliderect(query)]
+    assert set(index.query_rect(query)) == set(expected)
+
+    assert index.query_point(pg.Vector2(-0.5, 0.5)) == [boxes[19 * 5]]
+
+    near = index.query_radius(pg.Vector2(24, 24), 30)
+    assert boxes[20 * 5] in near
+    assert boxes[21 * 5] in near
+    assert boxes[22 * 5] not in near
+
+    index.remove(*expected)
+    assert index.query_rect(query) == []
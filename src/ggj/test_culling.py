@@ -0,0 +1,50 @@
+import pygame as pg
+
+from ggj.camera import camera
+from ggj.canvas import SurfaceCanvas
+from ggj.culling import CulledGroup
+
+
+class Square(pg.sprite.Sprite):
+    def __init__(self, world_rect: pg.Rect):
+        super().__init__()
+        self.world_rect = world_rect
+        self.image = pg.Surface(world_rect.size)
+        self.rect = self.image.get_rect()
+        self.alphas: list[float] = []
+
+    def interpolate(self, alpha: float) -> None:
+        self.alphas.append(alpha)
+
+
+class BlitCanvas(SurfaceCanvas):
+    def __init__(self):
+        super().__init__(pg.Surface((1, 1)))
+        self.drawn = []
+
+    def blits(self, blits):
+        self.drawn.extend(image for image, _ in blits)
+
+
+def test_only_sprites_near_the_view_port_drawn():
+    view = camera.get_view_port()
+    inside = Square(pg.Rect(view.center, (20, 20)))
+    straddling = Square(pg.Rect(view.left - 10, view.top, 20, 20))
+    in_margin = Square(pg.Rect(view.right + 5, view.top, 20, 20))
+    outside = Square(pg.Rect(view.right + 50, view.bottom + 50, 20, 20))
+    group = CulledGroup(inside, straddling, in_margin, outside, margin=10)
+
+    for alpha in (0.25, 0.5):
+        group.interpolate(alpha)
+    canvas = BlitCanvas()
+    group.draw_visible(canvas)
+
+    drawn = [inside.image, straddling.image, in_margin.image]
+    assert sorted(map(id, canvas.drawn)) == sorted(map(id, drawn))
+    assert inside.alphas == straddling.alphas == in_margin.alphas == [0.25, 0.5]
+    # culled sprites aren't placed either
+    assert outside.alphas == []
+
+    assert (group.stats.drawn, group.stats.culled) == (3, 1)
+    assert group.stats.frames == 2
+    assert (group.stats.total_drawn, group.stats.total_culled) == (6, 2)
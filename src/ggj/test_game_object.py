@@ -0,0 +1,79 @@
+import pygame as pg
+import pytest
+
+from ggj import main, player
+from ggj.benchmark import NO_INPUT, synthetic_map
+from ggj.game_object import GRAVITY, PhysicsWorld, PointMass, physics_world
+from ggj.headless import start_pygame
+from ggj.keys import key_manager, key_map
+from ggj.main import Game
+from ggj.map.importer import compile_map
+from ggj.telegraph import telegraph_placer
+
+
+def test_physics_world_step():
+    world = PhysicsWorld(capacity=1)
+    falling = PointMass(pg.Vector2(0, 0), 10, world)
+    pushed = PointMass(pg.Vector2(100, 0), 5, world)
+    assert len(world) == 2
+
+    for _ in range(3):
+        falling.apply_gravity()
+        pushed.add_force(pg.Vector2(5, 5))
+        pushed.make_rigid_y()
+        world.step(1 / 60)
+
+    # gravity / mass each step, 1 + 2 + 3 steps of velocity
+    assert falling.velocity == GRAVITY / 10 * 3
+    assert falling.position == GRAVITY / 10 * 6
+    # y forces are ignored on a body that is rigid in y
+    assert pushed.velocity == pg.Vector2(3, 0)
+    assert pushed.position == pg.Vector2(106, 0)
+    assert pushed.get_force() == pg.Vector2(0, 0)
+
+    assert falling.interpolated_position(0.5) == GRAVITY / 10 * 4.5
+
+
+@pytest.fixture
+def display(monkeypatch, tmp_path):
+    monkeypatch.setenv("SDL_VIDEODRIVER", "dummy")
+    monkeypatch.setenv("SDL_AUDIODRIVER", "dummy")
+    monkeypatch.setenv("GGJ_CACHE_DIR", str(tmp_path / "cache"))
+    canvas = start_pygame()
+    yield canvas
+    pg.quit()
+
+
+def test_physics_rate_keeps_game_speed(display, monkeypatch):
+    compiled = compile_map(synthetic_map(1000))
+    walk = NO_INPUT._replace(key_down=frozenset({key_map.player_right}))
+
+    def walked(hz: int) -> pg.Vector2:
+        monkeypatch.setattr(main, "PHYSICS_HZ", hz)
+        monkeypatch.setattr(player, "PHYSICS_HZ", hz)
+        game = Game(display, seed=0, compiled_map=compiled)
+        start = game.player.point_mass.position
+        # a second of falling onto the ground and walking right
+        for _ in range(60):
+            key_manager.restore(walk)
+            game.advance(1 / 60)
+        return game.player.point_mass.position - start
+
+    at_60, at_120 = walked(60), walked(120)
+    assert at_60.x > 500
+    assert at_120.x == pytest.approx(at_60.x, rel=0.03)
+    assert at_120.y == pytest.approx(at_60.y, abs=8)
+
+
+def test_new_game_starts_afresh(display):
+    compiled = compile_map(synthetic_map(1000))
+    first = Game(display, seed=0, compiled_map=compiled)
+    first.player.point_mass.add_force(pg.Vector2(0, 100))
+    first_poles = telegraph_placer.poles
+
+    second = Game(display, seed=0, compiled_map=compiled)
+
+    # only the new player is stepped
+    assert len(physics_world) == 1
+    assert second.player.point_mass.get_force() == pg.Vector2(0, 0)
+    assert not set(map(id, first_poles)) & set(map(id, telegraph_placer.poles))
@@ -0,0 +1,25 @@
+import threading
+
+import pytest
+
+from ggj.loading import AssetLoader
+
+
+def test_loader_progress_and_errors():
+    release = threading.Event()
+
+    def fail():
+        raise OSError("missing")
+
+    loader = AssetLoader(workers=1)
+    loader.submit(release.wait)
+    loader.submit(fail)
+    assert loader.progress() == (0, 2)
+    assert not loader.ready
+
+    release.set()
+    with pytest.raises(OSError):
+        loader.wait()
+    assert loader.ready
+    assert loader.progress() == (2, 2)
+    loader.shutdown()
@@ -0,0 +1,46 @@
+import logging
+
+import pytest
+
+from ggj.log import RateLimitedLogger, parse_levels
+
+
+def test_parse_levels():
+    assert parse_levels("") == {}
+    assert parse_levels("ggj.keys=info, ggj.terrain=WARNING") == {
+        "ggj.keys": logging.INFO,
+        "ggj.terrain": logging.WARNING,
+    }
+    with pytest.raises(ValueError, match="LOUD"):
+        parse_levels("ggj.keys=LOUD")
+    for entry in ("ggj.keys", "a=b=c", "=INFO"):
+        with pytest.raises(ValueError, match=entry):
+            parse_levels(f"ggj=INFO,{entry}")
+
+
+def test_rate_limited_logger_drops_and_counts(caplog):
+    now = [0.0]
+    logger = logging.getLogger("ggj.test_log")
+    limited = RateLimitedLogger(logger, interval=1.0, clock=lambda: now[0])
+
+    with caplog.at_level(logging.DEBUG, logger="ggj.test_log"):
+        for t in (0.0, 0.2, 0.4, 1.0, 1.5, 2.5):
+            now[0] = t
+            limited.debug("step at %.1f", t)
+        limited.debug("other %d", 1)
+
+    assert caplog.messages == [
+        "step at 0.0",
+        "step at 1.0 (2 more dropped)",
+        "step at 2.5 (1 more dropped)",
+        "other 1",
+    ]
+
+
+def test_rate_limited_logger_skips_when_disabled(caplog):
+    now = [0.0]
+    limited = RateLimitedLogger(logging.getLogger("ggj.test_log"), clock=lambda: now[0])
+
+    with caplog.at_level(logging.INFO, logger="ggj.test_log"):
+        limited.debug("step")
+    assert caplog.messages == []
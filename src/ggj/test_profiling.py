@@ -0,0 +1,28 @@
+from ggj.profiling import ProfileCapture
+
+
+def test_capture_stops_after_frames(tmp_path):
+    capture = ProfileCapture(frames=2, directory=tmp_path)
+    assert not capture.end_frame()
+
+    capture.start()
+    assert capture.active
+    assert not capture.end_frame()
+    assert capture.end_frame()
+
+    stats_path = capture.stop("player at (1, 2) near The base")
+    assert not capture.active
+    assert stats_path.exists()
+    summary = stats_path.with_suffix(".txt").read_text()
+    assert summary.startswith("2 frames, player at (1, 2) near The base")
+
+
+def test_captures_in_the_same_second_kept(tmp_path):
+    capture = ProfileCapture(frames=1, directory=tmp_path)
+    paths = []
+    for _ in range(3):
+        capture.start()
+        paths.append(capture.stop("nowhere"))
+
+    assert len(set(paths)) == 3
+    assert all(p.exists() and p.with_suffix(".txt").exists() for p in paths)
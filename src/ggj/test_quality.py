@@ -0,0 +1,42 @@
+from ggj.quality import QUALITY_LEVELS, UPGRADE_WINDOWS, QualityGovernor
+
+
+def test_quality_steps_down_and_back_up():
+    governor = QualityGovernor(budget_seconds=0.01, window=10)
+
+    # a window of slow frames drops a level
+    changes = [governor.record(0.012) for _ in range(10)]
+    assert changes[:-1] == [None] * 9
+    assert changes[-1] == QUALITY_LEVELS[1]
+
+    # frames just under budget aren't enough to go back up
+    for _ in range(10 * UPGRADE_WINDOWS):
+        assert governor.record(0.008) is None
+
+    # it takes a few windows of fast frames
+    changes = [governor.record(0.002) for _ in range(10 * UPGRADE_WINDOWS)]
+    assert [c for c in changes if c is not None] == [QUALITY_LEVELS[0]]
+    assert changes[-1] == QUALITY_LEVELS[0]
+
+
+def test_fixed_quality():
+    governor = QualityGovernor(budget_seconds=0.01, window=10)
+    governor.configure("low")
+    for _ in range(100):
+        assert governor.record(1.0) is None
+    assert governor.level.name == "low"
+
+
+def test_unknown_quality_adapts(caplog):
+    governor = QualityGovernor(budget_seconds=0.01, window=10)
+    governor.configure("ultra")
+
+    assert governor.adaptive
+    assert "high, medium, low, lowest" in caplog.text
+
+
+def test_every_level_down_draws_less():
+    for better, worse in zip(QUALITY_LEVELS, QUALITY_LEVELS[1:]):
+        assert worse.star_stride > better.star_stride or (
+            better.draw_mars and not worse.draw_mars
+        )
@@ -0,0 +1,55 @@
+import pygame as pg
+import pytest
+
+from ggj.benchmark import NO_INPUT, synthetic_map
+from ggj.constants import PHYSICS_HZ
+from ggj.headless import start_pygame
+from ggj.keys import key_manager, key_map
+from ggj.main import Game
+from ggj.map.importer import compile_map
+from ggj.render import DirtyRectRenderer, FullRenderer
+from ggj.canvas import SurfaceCanvas
+from ggj.ui import timings_overlay
+
+WALK = NO_INPUT._replace(key_down=frozenset({key_map.player_right}))
+
+
+@pytest.fixture
+def game(monkeypatch, tmp_path):
+    monkeypatch.setenv("SDL_VIDEODRIVER", "dummy")
+    monkeypatch.setenv("SDL_AUDIODRIVER", "dummy")
+    monkeypatch.setenv("GGJ_CACHE_DIR", str(tmp_path / "cache"))
+    # the overlay is drawn by both renderers, it mustn't change in between
+    monkeypatch.setattr(timings_overlay, "OVERLAY_REFRESH_FRAMES", 10**9)
+    canvas = start_pygame()
+    yield Game(canvas, seed=0, compiled_map=compile_map(synthetic_map(1000)))
+    pg.quit()
+
+
+def test_dirty_rects_match_full_redraw(game):
+    size = game.user_interface.parent.get_size()
+    full_canvas = SurfaceCanvas(pg.Surface(size))
+    dirty_canvas = SurfaceCanvas(pg.Surface(size))
+    full = FullRenderer(full_canvas)
+    dirty = DirtyRectRenderer(dirty_canvas)
+
+    def run(frames: int, state) -> None:
+        for frame in range(frames):
+            key_manager.restore(state)
+            # uneven frame times, so things are drawn between steps
+            alpha = game.advance(1.0 / PHYSICS_HZ * (0.7 + 0.5 * (frame % 2)))
+            full.draw_game(game, alpha)
+            dirty.draw_game(game, alpha)
+            assert pg.image.tobytes(full_canvas.surface, "RGB") == pg.image.tobytes(
+                dirty_canvas.surface, "RGB"
+            ), f"frame {frame}"
+
+    # land and let the camera settle, then walk off and stop again
+    run(120, NO_INPUT)
+    run(20, WALK)
+    run(120, NO_INPUT)
+
+    # the overlay is see-through, so has to be drawn over the layers each time
+    game.user_interface.toggle_timings()
+    dirty.invalidate()
+    run(30, NO_INPUT)
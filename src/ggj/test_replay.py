@@ -0,0 +1,81 @@
+import pygame as pg
+import pytest
+
+from ggj.benchmark import SCENARIOS, synthetic_map
+from ggj.headless import run, start_pygame
+from ggj.keys import InputState, key_manager
+from ggj.main import Game
+from ggj.map.importer import compile_map
+from ggj.replay import Recording
+from ggj.telegraph import telegraph_placer
+
+
+def test_recording_round_trip(tmp_path):
+    recording = Recording(seed=2**62 + 5, resolution=(960, 540))
+    recording.append(
+        1 / 60, InputState(frozenset(), frozenset(), False, None, None, None), (0, 0)
+    )
+    recording.append(
+        0.0171,
+        InputState(
+            frozenset({97, 1073741903}),
+            frozenset({97}),
+            True,
+            (3, -4),
+            None,
+            (640, 360),
+        ),
+        (1234.5678, -9.25),
+    )
+
+    path = tmp_path / "game.ggjr"
+    recording.save(path)
+    loaded = Recording.load(path)
+
+    assert loaded.seed == recording.seed
+    assert loaded.resolution == recording.resolution
+    assert loaded.frames == recording.frames
+
+
+def test_load_rejects_other_files(tmp_path):
+    path = tmp_path / "not-a-recording"
+    path.write_bytes(b"\0" * 32)
+    with pytest.raises(ValueError):
+        Recording.load(path)
+
+
+@pytest.fixture
+def display(monkeypatch, tmp_path):
+    monkeypatch.setenv("SDL_VIDEODRIVER", "dummy")
+    monkeypatch.setenv("SDL_AUDIODRIVER", "dummy")
+    monkeypatch.setenv("GGJ_CACHE_DIR", str(tmp_path / "cache"))
+    canvas = start_pygame()
+    yield canvas
+    pg.quit()
+
+
+def test_replay_reproduces_trajectory(display):
+    compiled = compile_map(synthetic_map(1000))
+    # walking, grappling, placing poles and standing still, at frame times
+    # that step the simulation zero to several times a frame
+    scripts = [SCENARIOS[name] for name in ("walk", "grapple", "poles", "idle")]
+    frame_times = (1 / 60, 1 / 30, 1 / 144, 0.1, 1 / 75)
+
+    game = Game(display, seed=7, compiled_map=compiled)
+    recording = Recording(7, display.resolution)
+    for i in range(600):
+        key_manager.update()
+        key_manager.restore(scripts[i // 150](i, game))
+        frame_seconds = frame_times[i % len(frame_times)]
+        game.advance(frame_seconds)
+        position = game.player.point_mass.position
+        recording.append(
+            frame_seconds, key_manager.snapshot(), (position.x, position.y)
+        )
+    game.shutdown()
+    assert len(telegraph_placer.poles) > 0
+
+    result = run(Game(display, seed=7, compiled_map=compiled), 0, replay=recording)
+
+    assert result.frames == 600
+    assert result.diverged_at is None
@@ -0,0 +1,13 @@
+from ggj.startup import StartupTimer
+
+
+def test_report_in_finishing_order():
+    timer = StartupTimer(started=0.0)
+    timer.marks = {"display init": 0.5, "imports": 0.25}
+    timer.mark("imports")
+
+    assert timer.report().splitlines() == [
+        "startup, from importing ggj:",
+        "  imports           250.0ms  (+250.0ms)",
+        "  display init      500.0ms  (+250.0ms)",
+    ]
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+import pygame as pg
+
+from ggj.tilemap import TileMap
+
+
+def floor_map() -> TileMap:
+    """10x5 map with a floor on the bottom row and a wall at x=6."""
+    solid = np.zeros((5, 10), dtype=bool)
+    solid[4, :] = True
+    solid[:, 6] = True
+    return TileMap(solid)
+
+
+def test_is_solid():
+    tilemap = floor_map()
+    assert tilemap.is_solid(0, 4)
+    assert tilemap.is_solid(6, 0)
+    assert not tilemap.is_solid(0, 0)
+    assert not tilemap.is_solid(-1, 4)
+    assert not tilemap.is_solid(10, 4)
+
+
+def test_tiles_overlapping():
+    tilemap = floor_map()
+    assert tilemap.tile_at(pg.Vector2(0, 4 * 48)) == (0, 4)
+    assert tilemap.tile_rect(0, 4) == pg.Rect(-24, 168, 48, 48)
+
+    assert tilemap.tiles_overlapping(pg.Rect(0, 0, 48, 48)) == []
+    assert tilemap.tiles_overlapping(pg.Rect(0, 160, 60, 10)) == [(0, 4), (1, 4)]
+
+
+def test_penetration():
+    tilemap = floor_map()
+    # sunk 8 px into the floor
+    assert tilemap.penetration_y(pg.Rect(0, 128, 48, 48), 1) == -8
+    # pushed 4 px into the wall from the left
+    assert tilemap.penetration_x(pg.Rect(220, 0, 48, 48), 1) == -4
+    assert tilemap.penetration_x(pg.Rect(0, 0, 48, 48), 1) == 0
+
+
+def test_raycast():
+    tilemap = floor_map()
+
+    # straight down onto the floor, whose top edge is at y=168
+    hit = tilemap.raycast(pg.Vector2(0, 0), pg.Vector2(0, 1), 1000)
+    assert hit is not None
+    assert hit.tile == (0, 4)
+    assert hit.point == pg.Vector2(0, 168)
+    assert hit.distance == 168
+
+    # diagonally into the wall, whose left edge is at x=264
+    hit = tilemap.raycast(pg.Vector2(0, 0), pg.Vector2(1, 0.1), 1000)
+    assert hit is not None
+    assert hit.tile == (6, 1)
+    assert hit.point.x == pytest.approx(264)
+
+    # out of reach, and pointing away from everything
+    assert tilemap.raycast(pg.Vector2(0, 0), pg.Vector2(0, 1), 100) is None
+    assert tilemap.raycast(pg.Vector2(0, 0), pg.Vector2(-1, -1), 1000) is None
@@ -0,0 +1,39 @@
+import json
+
+import numpy as np
+
+from ggj.timings import STAGES, FrameTimer
+
+
+def test_disabled_timer_records_nothing():
+    timer = FrameTimer()
+    timer.start_frame()
+    timer.lap("input")
+    timer.end_frame()
+    assert len(timer) == 0
+    assert timer.stats() == {}
+
+
+def test_frames_kept_in_ring_buffer(tmp_path):
+    timer = FrameTimer(enabled=True, capacity=4)
+    for _ in range(6):
+        timer.start_frame()
+        timer.lap("input")
+        timer.lap("physics")
+        timer.lap("physics")
+        timer.end_frame()
+
+    assert len(timer) == 4
+    frames = timer.frames()
+    assert frames.shape == (4, len(STAGES))
+    # only the lapped stages have time charged to them
+    lapped = [STAGES.index("input"), STAGES.index("physics")]
+    assert np.all(np.delete(frames, lapped, axis=1) == 0)
+
+    stats = timer.stats()
+    assert set(stats) == {*STAGES, "frame"}
+    assert stats["frame"]["p50"] >= stats["physics"]["p50"]
+
+    timer.export(tmp_path / "t.csv", tmp_path / "t.json")
+    assert len((tmp_path / "t.csv").read_text().splitlines()) == 5
+    assert json.loads((tmp_path / "t.json").read_text())["frames"] == 4
@@ -0,0 +1,170 @@
+import math
+from typing import NamedTuple, Optional
+
+import numpy as np
+import pygame as pg
+
+from ggj.world import SURFACE_BLOCK_SIZE
+
+TILE_WIDTH, TILE_HEIGHT = SURFACE_BLOCK_SIZE
+
+# Surface blocks are centered on their map coordinates, so tile (0, 0) spans
+# from -half a block to +half a block.
+TILE_OFFSET_X = TILE_WIDTH // 2
+TILE_OFFSET_Y = TILE_HEIGHT // 2
+
+
+class RayHit(NamedTuple):
+    tile: tuple[int, int]
+    # where the ray entered the tile, in world coordinates
+    point: pg.Vector2
+    distance: float
+
+
+class TileMap:
+    """
+    Occupancy grid of solid tiles in map units. Lets collision checks look up
+    the handful of tiles around a rect directly instead of iterating sprites.
+    """
+
+    width: int
+    height: int
+    # flattened row-major occupancy, one byte per tile for fast lookups
+    _cells: bytes
+
+    def __init__(self, solid: np.ndarray):
+        """
+        Args:
+            solid: 2D bool array indexed [y, x], true where a tile is solid.
+        """
+        self.height, self.width = solid.shape
+        self.solid = np.ascontiguousarray(solid, dtype=bool)
+        self._cells = self.solid.astype(np.uint8).tobytes()
+
+    @classmethod
+    def from_world_array(cls, w_array: np.ndarray) -> "TileMap":
+        """Tile map of the surface blocks in a world array (see map.md)."""
+        return cls((w_array & 0xF0) == 0)
+
+    @staticmethod
+    def tile_at(point: pg.Vector2) -> tuple[int, int]:
+        """Tile containing a world position."""
+        return (
+            math.floor((point[0] + TILE_OFFSET_X) / TILE_WIDTH),
+            math.floor((point[1] + TILE_OFFSET_Y) / TILE_HEIGHT),
+        )
+
+    @staticmethod
+    def tile_rect(tile_x: int, tile_y: int) -> pg.Rect:
+        """World rect of a tile."""
+        return pg.Rect(
+            tile_x * TILE_WIDTH - TILE_OFFSET_X,
+            tile_y * TILE_HEIGHT - TILE_OFFSET_Y,
+            TILE_WIDTH,
+            TILE_HEIGHT,
+        )
+
+    def is_solid(self, tile_x: int, tile_y: int) -> bool:
+        """True if the tile is solid. Everything outside the map is empty."""
+        if 0 <= tile_x < self.width and 0 <= tile_y < self.height:
+            return self._cells[tile_y * self.width + tile_x] != 0
+        return False
+
+    def tiles_overlapping(self, rect: pg.Rect) -> list[tuple[int, int]]:
+        """Solid tiles overlapping a rect in world coordinates."""
+        first_x = max((rect.left + TILE_OFFSET_X) // TILE_WIDTH, 0)
+        last_x = min((rect.right - 1 + TILE_OFFSET_X) // TILE_WIDTH, self.width - 1)
+        first_y = max((rect.top + TILE_OFFSET_Y) // TILE_HEIGHT, 0)
+        last_y = min((rect.bottom - 1 + TILE_OFFSET_Y) // TILE_HEIGHT, self.height - 1)
+
+        cells = self._cells
+        return [
+            (x, y)
+            for y in range(first_y, last_y + 1)
+            for x in range(first_x, last_x + 1)
+            if cells[y * self.width + x]
+        ]
+
+    def penetration_x(self, rect: pg.Rect, dx: float) -> int:
+        """
+        How far a rect moving horizontally must be pushed back along x to stop
+        overlapping solid tiles, 0 if it is clear.
+
+        Args:
+            rect: The rect after moving.
+            dx: The direction it moved in.
+        """
+        tiles = self.tiles_overlapping(rect)
+        if not tiles or dx == 0:
+            return 0
+        if dx > 0:
+            return min(self.tile_rect(*t).left for t in tiles) - rect.right
+        return max(self.tile_rect(*t).right for t in tiles) - rect.left
+
+    def penetration_y(self, rect: pg.Rect, dy: float) -> int:
+        """Vertical counterpart of penetration_x."""
+        tiles = self.tiles_overlapping(rect)
+        if not tiles or dy == 0:
+            return 0
+        if dy > 0:
+            return min(self.tile_rect(*t).top for t in tiles) - rect.bottom
+        return max(self.tile_rect(*t).bottom for t in tiles) - rect.top
+
+    def raycast(
+        self, origin: pg.Vector2, direction: pg.Vector2, max_distance: float
+    ) -> Optional[RayHit]:
+        """
+        Walk the tile grid from origin along direction (DDA) and return the
+        first solid tile hit within max_distance, if any.
+
+        Args:
+            origin: Start of the ray in world coordinates.
+            direction: Direction of the ray, doesn't need to be normalised.
+            max_distance: Furthest distance to look in world units.
+        """
+        tile_x, tile_y = self.tile_at(origin)
+        if self.is_solid(tile_x, tile_y):
+            return RayHit((tile_x, tile_y), pg.Vector2(origin), 0.0)
+
+        if (length := direction.length()) == 0:
+            return None
+        dir_x, dir_y = direction.x / length, direction.y / length
+
+        # distance along the ray to the next vertical / horizontal tile
+        # boundary, and the distance between boundaries
+        step_x = 1 if dir_x > 0 else -1
+        if dir_x != 0:
+            boundary_x = (tile_x + (dir_x > 0)) * TILE_WIDTH - TILE_OFFSET_X
+            next_x = (boundary_x - origin.x) / dir_x
+            delta_x = TILE_WIDTH / abs(dir_x)
+        else:
+            next_x = delta_x = math.inf
+
+        step_y = 1 if dir_y > 0 else -1
+        if dir_y != 0:
+            boundary_y = (tile_y + (dir_y > 0)) * TILE_HEIGHT - TILE_OFFSET_Y
+            next_y = (boundary_y - origin.y) / dir_y
+            delta_y = TILE_HEIGHT / abs(dir_y)
+        else:
+            next_y = delta_y = math.inf
+
+        while True:
+            if next_x < next_y:
+                distance = next_x
+                tile_x += step_x
+                next_x += delta_x
+            else:
+                distance = next_y
+                tile_y += step_y
+                next_y += delta_y
+
+            if distance > max_distance:
+                return None
+            if self.is_solid(tile_x, tile_y):
+                return RayHit(
+                    (tile_x, tile_y),
+                    pg.Vector2(
+                        origin.x + dir_x * distance, origin.y + dir_y * distance
+                    ),
+                    distance,
+                )
@@ -0,0 +1,113 @@
+import csv
+import json
+import logging
+import time
+from pathlib import Path
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Parts of a frame that are timed, in the order they usually happen.
+STAGES = (
+    "input",
+    "simulation",
+    "physics",
+    "interpolate",
+    "background",
+    "objects",
+    "terrain",
+    "grapple",
+    "ui",
+    "present",
+    "tick",
+)
+
+# Frames of timings kept.
+TIMINGS_CAPACITY = 600
+
+PERCENTILES = (50, 95, 99)
+
+
+class FrameTimer:
+    """
+    Times each stage of a frame, keeping the last few hundred frames.
+
+    Each lap is charged with the time since the previous lap, so laps go
+    after the work they time. A stage can be lapped more than once in a
+    frame, like physics when it steps more than once. Laps do nothing when
+    the timer is disabled.
+    """
+
+    def __init__(self, enabled: bool = False, capacity: int = TIMINGS_CAPACITY):
+        self.enabled = enabled
+        self._stage_index = {stage: i for i, stage in enumerate(STAGES)}
+        # seconds per stage per frame, used as a ring buffer
+        self._frames = np.zeros((capacity, len(STAGES)))
+        self._count = 0
+        self._current = [0.0] * len(STAGES)
+        self._last = time.perf_counter()
+
+    def __len__(self) -> int:
+        return min(self._count, len(self._frames))
+
+    def clear(self) -> None:
+        """Forget every recorded frame."""
+        self._count = 0
+
+    def start_frame(self) -> None:
+        if not self.enabled:
+            return
+        self._current = [0.0] * len(STAGES)
+        self._last = time.perf_counter()
+
+    def lap(self, stage: str) -> None:
+        """Charge the time since the last lap to a stage."""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self._current[self._stage_index[stage]] += now - self._last
+        self._last = now
+
+    def end_frame(self) -> None:
+        if not self.enabled:
+            return
+        self._frames[self._count % len(self._frames)] = self._current
+        self._count += 1
+
+    def frames(self) -> np.ndarray:
+        """Recorded frames, oldest first, as seconds per stage."""
+        if self._count <= len(self._frames):
+            return self._frames[: self._count]
+        return np.roll(self._frames, -(self._count % len(self._frames)), axis=0)
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        """Percentiles of each stage and the whole frame, in milliseconds."""
+        frames = self.frames() * 1000.0
+        if len(frames) == 0:
+            return {}
+
+        columns = {stage: frames[:, i] for i, stage in enumerate(STAGES)}
+        columns["frame"] = frames.sum(axis=1)
+        return {
+            name: {
+                f"p{p}": float(value)
+                for p, value in zip(PERCENTILES, np.percentile(column, PERCENTILES))
+            }
+            for name, column in columns.items()
+        }
+
+    def export(self, csv_path: Path, json_path: Path) -> None:
+        """Write every recorded frame as CSV, and the stats as JSON."""
+        with open(csv_path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow([f"{stage}_ms" for stage in STAGES])
+            writer.writerows((self.frames() * 1000.0).round(4).tolist())
+
+        with open(json_path, "w") as f:
+            json.dump({"frames": len(self), "stats_ms": self.stats()}, f, indent=2)
+
+        logger.info(f"exported timings of {len(self)} frames to {csv_path}")
+
+
+frame_timer = FrameTimer()
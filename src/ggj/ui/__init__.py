@@ -6,6 +6,9 @@ from typing import cast
 import pygame.sprite
 import pygame as pg
 from .message_box import MessageBox
+from .timings_overlay import TimingsOverlay
+from ..canvas import Canvas
+from ..timings import frame_timer
 from ..world import map_to_world_coords
 
 logger = logging.getLogger(__name__)
@@ -20,7 +23,7 @@ def to_tuple(v: pg.Vector2) -> tuple[int, int]:
 class UserInterface(pygame.sprite.Group):
     def __init__(
         self,
-        parent: pygame.surface.Surface,
+        parent: Canvas,
         location_markers: dict[str, list[pg.Vector2]],
     ):
         super().__init__()
@@ -34,6 +37,11 @@ class UserInterface(pygame.sprite.Group):
         self.message_box.add(self)
         self.refresh_message_box_location()
 
+        # frame timings, hidden until toggled
+
+        self.timings_overlay = TimingsOverlay(frame_timer)
+        self.timings_overlay.rect.topleft = (UI_PADDING_PX, UI_PADDING_PX)
+
         # location markers stuff
 
         self.location_markers: dict[str, list[tuple[int, int]]] = {
@@ -65,15 +73,59 @@ class UserInterface(pygame.sprite.Group):
                 f"Location update - {self.vec_to_location[ppt[0]]}"
             )
 
+    def nearest_location(self, pos: pg.Vector2) -> str:
+        """Name of the location marker closest to a world position."""
+        return min(
+            (
+                (pos.distance_squared_to(marker), name)
+                for name, markers in self.location_markers.items()
+                for marker in markers
+            ),
+            default=(0.0, "nowhere"),
+        )[1]
+
     def refresh_message_box_location(self):
         self.message_box.rect.x = (
             self.parent.get_rect().width - self.message_box.rect.width - UI_PADDING_PX
         )
         self.message_box.rect.y = UI_PADDING_PX
 
-    def draw(self, *args, **kwargs):
+    def toggle_timings(self) -> bool:
+        """Show or hide the frame timings, returns whether they're shown."""
+        if self.timings_overlay.alive():
+            self.timings_overlay.kill()
+        else:
+            self.timings_overlay.add(self)
+        return self.timings_overlay.alive()
+
+    @property
+    def revision(self) -> int:
+        """Changes whenever something in the interface looks different."""
+        return self.message_box.revision + self.timings_overlay.revision
+
+    def rects(self) -> list[pg.Rect]:
+        return [cast(pg.Rect, s.rect) for s in self.sprites()]
+
+    def translucent_rects(self) -> list[pg.Rect]:
+        """Where the interface is see-through, shown over what's under it."""
+        if self.timings_overlay.alive():
+            return [self.timings_overlay.rect]
+        return []
+
+    def draw_on(self, canvas: Canvas) -> None:
         self.refresh_message_box_location()
-        super().draw(*args, **kwargs)
+        canvas.blit(
+            self.message_box.image,
+            self.message_box.rect,
+            version=self.message_box.revision,
+        )
+        if self.timings_overlay.alive():
+            self.timings_overlay.refresh()
+            canvas.blit(
+                self.timings_overlay.image,
+                self.timings_overlay.rect,
+                version=self.timings_overlay.revision,
+            )
 
     def shutdown(self):
         self.stopped.set()
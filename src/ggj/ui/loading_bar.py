@@ -0,0 +1,43 @@
+import pygame
+
+from ..keys import key_map
+
+LOADING_BAR_WIDTH = 400
+
+
+class LoadingBar(pygame.sprite.Sprite):
+    """How far loading has got, then what to press to start."""
+
+    def __init__(self):
+        pygame.sprite.Sprite.__init__(self)
+
+        self.font = pygame.font.Font(pygame.font.match_font("monospace"), size=15)
+        self.image = pygame.Surface([LOADING_BAR_WIDTH, self.font.get_height() + 16])
+        self.rect = self.image.get_rect()
+
+        # bumped whenever the image changes
+
+        self.revision = 0
+        self._shown = (-1, -1)
+
+    def show(self, done: int, total: int) -> None:
+        """Show progress, once everything is done the start prompt is shown."""
+        if (done, total) == self._shown:
+            return
+        self._shown = (done, total)
+
+        self.image.fill("black")
+        if done < total:
+            bar = self.image.get_rect().inflate(-8, -8)
+            pygame.draw.rect(self.image, "grey40", bar, width=1)
+            bar.width = bar.width * done // max(total, 1)
+            pygame.draw.rect(self.image, "grey40", bar)
+            text = f"loading {done}/{total}"
+        else:
+            text = f"press {pygame.key.name(key_map.start_game)} to start"
+
+        rendered = self.font.render(text, True, "white")
+        self.image.blit(
+            rendered, rendered.get_rect(center=self.image.get_rect().center)
+        )
+        self.revision += 1
@@ -23,6 +23,10 @@ class MessageBox(pygame.sprite.Sprite):
 
         self.messages = []
 
+        # bumped whenever the image changes
+
+        self.revision = 0
+
     def _line_width(self, message: list[str]) -> int:
         return self.font.size("".join(message))[0]
 
@@ -68,6 +72,8 @@ class MessageBox(pygame.sprite.Sprite):
 
             lines_rendered += len(group)
 
+        self.revision += 1
+
     def _create_line_group(self, message: str) -> list[str]:
         """Split a string message into a group of lines that will fit into the box when rendered."""
 
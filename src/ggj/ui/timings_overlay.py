@@ -0,0 +1,52 @@
+import pygame
+
+from ..timings import FrameTimer, PERCENTILES, STAGES
+
+# Frames between refreshes of the numbers, so they can be read.
+OVERLAY_REFRESH_FRAMES = 30
+
+
+class TimingsOverlay(pygame.sprite.Sprite):
+    """Table of how long each stage of a frame takes, in milliseconds."""
+
+    def __init__(self, timer: FrameTimer):
+        pygame.sprite.Sprite.__init__(self)
+
+        self.timer = timer
+        self.font = pygame.font.Font(pygame.font.match_font("monospace"), size=14)
+
+        # a row per stage, plus the header and the whole frame
+
+        rows = len(STAGES) + 2
+        self.image = pygame.Surface([330, rows * self.font.get_height() + 10])
+        self.image.set_alpha(200)
+        self.rect = self.image.get_rect()
+
+        # bumped whenever the image changes
+
+        self.revision = 0
+        self._frames_until_refresh = 0
+
+    def refresh(self) -> None:
+        """Re-render the numbers every so often, call once a frame."""
+        self._frames_until_refresh -= 1
+        if self._frames_until_refresh > 0:
+            return
+        self._frames_until_refresh = OVERLAY_REFRESH_FRAMES
+
+        self.image.fill("black")
+        stats = self.timer.stats()
+        lines = [f"{'stage':<12}" + "".join(f"{f'p{p}':>8}" for p in PERCENTILES)]
+        for name in (*STAGES, "frame"):
+            values = stats.get(name, {})
+            lines.append(
+                f"{name:<12}"
+                + "".join(f"{values.get(f'p{p}', 0.0):>8.2f}" for p in PERCENTILES)
+            )
+
+        y = 5
+        for line in lines:
+            self.image.blit(self.font.render(line, True, "white"), (5, y))
+            y += self.font.get_height()
+
+        self.revision += 1
@@ -1,10 +1,12 @@
 import random
 from functools import lru_cache
+from typing import Optional
 
 import pygame
 
 from ggj.assets import FLOOR_SPRIES_PATH
-from ggj.game_object import GameObject, PointMass
+from ggj.baked import load_baked
+from ggj.game_object import GameObject
 from ggj.camera import camera
 import pygame as pg
 import logging
@@ -12,15 +14,23 @@ import logging
 SURFACE_BLOCK_SIZE = (48, 48)
 COLOR = pg.Color(255, 125, 0)
 
-WALL_MASS = 1000
-
 logger = logging.getLogger(__name__)
 FLOOR_BLOCK_SIZE = 22
 
 
 @lru_cache
 def load_surface_block_images() -> list[pg.Surface]:
-    sheet = pg.image.load(FLOOR_SPRIES_PATH).convert_alpha()
+    return load_baked(
+        "surface-blocks",
+        FLOOR_SPRIES_PATH,
+        (FLOOR_BLOCK_SIZE, SURFACE_BLOCK_SIZE),
+        _build_surface_block_images,
+        alpha=False,
+    )
+
+
+def _build_surface_block_images(sheet: pg.Surface) -> list[pg.Surface]:
+    sheet = sheet.convert_alpha()
 
     if (
         sheet.get_height() % FLOOR_BLOCK_SIZE != 0
@@ -51,13 +61,15 @@ def map_to_world_coords(v: pg.Vector2) -> pg.Vector2:
 
 
 class SurfaceBlock(pg.sprite.Sprite, GameObject):
-    _point_mass: PointMass
+    # position in map units, blocks are static so have no point mass
+    _position: pg.Vector2
 
-    def __init__(self, position: pg.Vector2):
+    def __init__(self, position: pg.Vector2, variant: Optional[int] = None):
         super().__init__()
 
-        self.image = random.choice(load_surface_block_images())
-        self._point_mass = PointMass(position, WALL_MASS)
+        images = load_surface_block_images()
+        self.image = random.choice(images) if variant is None else images[variant]
+        self._position = position
 
         self._populate_rect()
 
@@ -70,9 +82,7 @@ class SurfaceBlock(pg.sprite.Sprite, GameObject):
     @property
     def world_rect(self) -> pg.Rect:
         return pg.Rect(
-            self._point_mass.position.x * SURFACE_BLOCK_SIZE[0]
-            - (SURFACE_BLOCK_SIZE[0] / 2),
-            self._point_mass.position.y * SURFACE_BLOCK_SIZE[1]
-            - (SURFACE_BLOCK_SIZE[1] / 2),
+            self._position.x * SURFACE_BLOCK_SIZE[0] - (SURFACE_BLOCK_SIZE[0] / 2),
+            self._position.y * SURFACE_BLOCK_SIZE[1] - (SURFACE_BLOCK_SIZE[1] / 2),
             *SURFACE_BLOCK_SIZE,
         )